@@ -3,11 +3,12 @@ from typing import Any
 from collections.abc import Callable, Collection, Mapping
 
 import geopandas as gpd
+import numba
 import numpy as np
+import shapely
 from geopandas import GeoDataFrame, GeoSeries
 from pandas.api.types import is_dict_like
-from shapely import Geometry, box, extract_unique_points
-from shapely.geometry import Polygon
+from shapely import Geometry, box
 
 from .conversion import to_gdf
 from .general import clean_clip, is_bbox_like
@@ -196,19 +197,17 @@ def make_grid_from_bbox(
         crs: Coordinate reference system.
 
     Returns:
-        GeoDataFrame with grid geometries.
+        GeoDataFrame with grid geometries, ordered by x first, then y.
     """
-    xs0, ys0, xs1, ys1 = [], [], [], []
-    for x0 in np.arange(minx, maxx + gridsize, gridsize):
-        for y0 in np.arange(miny, maxy + gridsize, gridsize):
-            x1 = x0 - gridsize
-            y1 = y0 + gridsize
-            xs0.append(x0)
-            ys0.append(y0)
-            xs1.append(x1)
-            ys1.append(y1)
-
-    grid_cells = box(xs0, ys0, xs1, ys1)
+    # 'ij' indexing gives the cells ordered by x first, then y
+    xs0, ys0 = np.meshgrid(
+        np.arange(minx, maxx + gridsize, gridsize),
+        np.arange(miny, maxy + gridsize, gridsize),
+        indexing="ij",
+    )
+    xs0, ys0 = xs0.ravel(), ys0.ravel()
+
+    grid_cells = box(xs0, ys0, xs0 - gridsize, ys0 + gridsize)
 
     return gpd.GeoDataFrame(grid_cells, columns=["geometry"], crs=crs)
 
@@ -309,35 +308,43 @@ def make_ssb_grid(
     cols = list(np.arange(minx, maxx + gridsize, gridsize))
     rows = list(np.arange(miny, maxy + gridsize, gridsize))
 
-    polygons = []
-    for x in cols[:-1]:
-        for y in rows[:-1]:
-            polygons.append(
-                Polygon(
-                    [
-                        (x, y),
-                        (x + gridsize, y),
-                        (x + gridsize, y + gridsize),
-                        (x, y + gridsize),
-                    ]
-                )
-            )
+    # lower left corners, ordered by x first, then y
+    xs, ys = np.meshgrid(cols[:-1], rows[:-1], indexing="ij")
+    lower_left = np.column_stack([xs.ravel(), ys.ravel()])
+
+    # the closed ring of each cell, with shape (n cells, 5 corners, xy)
+    corner_offsets = np.array(
+        [[0, 0], [gridsize, 0], [gridsize, gridsize], [0, gridsize], [0, 0]]
+    )
+    polygons = shapely.polygons(lower_left[:, np.newaxis, :] + corner_offsets)
 
     grid = gpd.GeoDataFrame({"geometry": polygons}, crs=25833)
 
-    # Make SSB id
-    grid["ostc"] = (
-        (np.floor((grid.geometry.centroid.x + 2000000) / gridsize) * gridsize).apply(
-            int
-        )
-    ).apply(str)
-    grid["nordc"] = (
-        (np.floor((grid.geometry.centroid.y) / gridsize) * gridsize).apply(int)
-    ).apply(str)
-    grid["SSBID"] = grid["ostc"] + grid["nordc"]
+    centroids = shapely.get_coordinates(shapely.centroid(polygons))
+    grid["SSBID"] = _make_ssb_ids(centroids[:, 0], centroids[:, 1], gridsize)
     return grid[["SSBID", "geometry"]]
 
 
+def _make_ssb_ids(xs: np.ndarray, ys: np.ndarray, gridsize: int) -> np.ndarray:
+    """SSB grid ids made from the x and y coordinates in 25833."""
+    # binning in float64, since float32 would move points near the cell edges.
+    # The binned coordinates of 25833 fit in 32 bit integers
+    ostc = (np.floor((xs + 2000000) / gridsize) * gridsize).astype(np.int32)
+    nordc = (np.floor(ys / gridsize) * gridsize).astype(np.int32)
+    # room for two signed 32 bit integers
+    return _concat_int_strings(ostc, nordc, np.empty(len(ostc), dtype="U22"))
+
+
+@numba.njit(cache=True)
+def _concat_int_strings(
+    ints1: np.ndarray, ints2: np.ndarray, out: np.ndarray
+) -> np.ndarray:
+    """Writes the integers as concatenated strings without temporary string arrays."""
+    for i in range(len(ints1)):
+        out[i] = str(ints1[i]) + str(ints2[i])
+    return out
+
+
 def add_grid_id(
     gdf: GeoDataFrame, gridsize: int, out_column: str = "SSBID"
 ) -> GeoDataFrame:
@@ -360,16 +367,9 @@ def add_grid_id(
             "Geodataframe must have crs = 25833. Use df.set_crs(25833) to set "
             "projection or df.to_crs(25833) for transforming."
         )
-    midlrdf = gdf.copy()
-    midlrdf["ostc"] = (
-        (np.floor((midlrdf.geometry.x + 2000000) / gridsize) * gridsize).apply(int)
-    ).apply(str)
-    midlrdf["nordc"] = (
-        (np.floor((midlrdf.geometry.y) / gridsize) * gridsize).apply(int)
-    ).apply(str)
-    midlrdf[out_column] = midlrdf["ostc"] + midlrdf["nordc"]
-    midlrdf = midlrdf.drop(columns=["nordc", "ostc"])
-    return midlrdf
+    # geopandas' x and y raise if the geometries are not points
+    ids = _make_ssb_ids(gdf.geometry.x.values, gdf.geometry.y.values, gridsize)
+    return gdf.assign(**{out_column: ids})
 
 
 def bounds_to_polygon(
@@ -399,11 +399,12 @@ def bounds_to_polygon(
     1  POLYGON ((0.00000 0.00000, 0.00000 0.00000, 0....
 
     """
+    boxes = box(*gdf.bounds.values.T)
     if isinstance(gdf, GeoSeries):
-        return GeoSeries([box(*arr) for arr in gdf.bounds.values], index=gdf.index)
+        return GeoSeries(boxes, index=gdf.index, crs=gdf.crs)
     if copy:
         gdf = gdf.copy()
-    gdf.geometry = [box(*arr) for arr in gdf.bounds.values]
+    gdf.geometry = boxes
     return gdf
 
 
@@ -432,10 +433,39 @@ def bounds_to_points(
     0  MULTIPOINT (1.00000 0.00000, 1.00000 1.00000, ...
     1                       MULTIPOINT (0.00000 0.00000)
     """
-    as_bounds = bounds_to_polygon(gdf, copy=copy)
+    minx, miny, maxx, maxy = gdf.bounds.values.T
+
+    # the corners in the same order as the exterior ring of shapely.box
+    corners = np.stack(
+        [
+            np.column_stack([maxx, miny]),
+            np.column_stack([maxx, maxy]),
+            np.column_stack([minx, maxy]),
+            np.column_stack([minx, miny]),
+        ],
+        axis=1,
+    )
+
+    # only keeping unique corners, like extract_unique_points would for the boxes
+    # of points and straight lines. Empty and missing geometries have NaN bounds
+    has_width = minx != maxx
+    has_height = miny != maxy
+    keep = (
+        np.column_stack(
+            [np.full(len(minx), True), has_height, has_width, has_width & has_height]
+        )
+        & ~np.isnan(minx)[:, np.newaxis]
+    )
+
+    # rows without any kept corners are left as None
+    multipoints = np.full(len(minx), None, dtype=object)
+    shapely.multipoints(corners[keep], indices=np.nonzero(keep)[0], out=multipoints)
+
     if isinstance(gdf, GeoSeries):
-        return GeoSeries(extract_unique_points(as_bounds), index=gdf.index)
-    gdf.geometry = extract_unique_points(as_bounds.geometry)
+        return GeoSeries(multipoints, index=gdf.index, crs=gdf.crs)
+    if copy:
+        gdf = gdf.copy()
+    gdf.geometry = multipoints
     return gdf
 
 
@@ -517,6 +547,6 @@ def points_in_bounds(gdf: GeoDataFrame | GeoSeries, n2: int):
         minx, miny, maxx, maxy = gdf.total_bounds
     xs = np.linspace(minx, maxx, num=n2)
     ys = np.linspace(miny, maxy, num=n2)
-    x_coords, y_coords = np.meshgrid(xs, ys, indexing="ij")
-    coords = np.concatenate((x_coords.reshape(-1, 1), y_coords.reshape(-1, 1)), axis=1)
-    return to_gdf(coords, crs=gdf.crs)
+    # same order as a meshgrid with 'ij' indexing, without making the 2d grids
+    points = shapely.points(np.repeat(xs, n2), np.tile(ys, n2))
+    return GeoDataFrame({"geometry": points}, crs=getattr(gdf, "crs", None))
@@ -80,6 +80,8 @@ def coordinate_array(
 
     Args:
         gdf: GeoDataFrame or GeoSeries of point geometries.
+        strict: If True, a ValueError is raised if not all geometries are points.
+            Otherwise, non-point and empty geometries get NaN coordinates.
 
     Returns:
         np.ndarray of np.ndarrays of coordinates.
@@ -110,11 +112,18 @@ def coordinate_array(
     """
     if isinstance(gdf, GeoDataFrame):
         gdf = gdf.geometry
+    geoms = np.asarray(gdf.values)
+
+    # empty points have no coordinates, so they are treated like non-points
+    is_point = (shapely.get_type_id(geoms) == 0) & ~shapely.is_empty(geoms)
+    if is_point.all():
+        return shapely.get_coordinates(geoms)
     if strict:
-        return np.array([(geom.x, geom.y) for geom in gdf])
-    return np.array(
-        [(geom.x, geom.y) if hasattr(geom, "x") else (None, None) for geom in gdf]
-    )
+        raise ValueError("All geometries must be points when 'strict' is True.")
+
+    coords = np.full((len(geoms), 2), np.nan)
+    coords[is_point] = shapely.get_coordinates(geoms[is_point])
+    return coords
 
 
 def to_gdf(
@@ -1,16 +1,17 @@
 import numbers
-import warnings
 from collections.abc import Hashable, Iterable
 from typing import Any
 
 import numpy as np
 import pandas as pd
 import pyproj
+import shapely
 from geopandas import GeoDataFrame, GeoSeries
 from geopandas.array import GeometryArray, GeometryDtype
 from numpy.typing import NDArray
 from shapely import (
     Geometry,
+    area,
     get_coordinates,
     get_exterior_ring,
     get_interior_ring,
@@ -18,9 +19,10 @@ from shapely import (
     get_parts,
     linestrings,
     make_valid,
+    points,
+    union_all,
 )
 from shapely.geometry import LineString, Point
-from shapely.ops import unary_union
 
 from .geometry_types import get_geom_type, make_all_singlepart, to_single_geom_type
 
@@ -106,13 +108,15 @@ def _push_geom_col(gdf: GeoDataFrame) -> GeoDataFrame:
 
 
 def drop_inactive_geometry_columns(gdf: GeoDataFrame) -> GeoDataFrame:
-    for col in gdf.columns:
-        if (
-            isinstance(gdf[col].dtype, GeometryDtype)
-            and col != gdf._geometry_column_name
-        ):
-            gdf = gdf.drop(col, axis=1)
-    return gdf
+    geom_col = gdf._geometry_column_name
+    to_drop = [
+        col
+        for col, dtype in gdf.dtypes.items()
+        if isinstance(dtype, GeometryDtype) and col != geom_col
+    ]
+    if not to_drop:
+        return gdf
+    return gdf.drop(columns=to_drop)
 
 
 def rename_geometry_if(gdf: GeoDataFrame) -> GeoDataFrame:
@@ -122,9 +126,9 @@ def rename_geometry_if(gdf: GeoDataFrame) -> GeoDataFrame:
     elif geom_col in gdf.columns:
         return gdf.rename_geometry("geometry")
 
-    geom_cols = list(
-        {col for col in gdf.columns if isinstance(gdf[col].dtype, GeometryDtype)}
-    )
+    geom_cols = [
+        col for col, dtype in gdf.dtypes.items() if isinstance(dtype, GeometryDtype)
+    ]
     if len(geom_cols) == 1:
         gdf._geometry_column_name = geom_cols[0]
         return gdf.rename_geometry("geometry")
@@ -186,36 +190,33 @@ def clean_geoms(
     1      LINESTRING (1.00000 1.00000, 2.00000 2.00000)
     2  POLYGON ((3.00000 3.00000, 4.00000 4.00000, 3....
     """
-    warnings.filterwarnings("ignore", "GeoSeries.notna", UserWarning)
-
     if isinstance(gdf, GeoDataFrame):
-        # only repair if necessary
-        if not gdf.geometry.is_valid.all():
-            gdf.geometry = gdf.make_valid()
-
-        notna = gdf.geometry.notna()
-        if not notna.all():
-            gdf = gdf.loc[notna]
-
-        is_empty = gdf.geometry.is_empty
-        if is_empty.any():
-            gdf = gdf.loc[~is_empty]
-
+        geoms = gdf.geometry
     elif isinstance(gdf, GeoSeries):
-        if not gdf.is_valid.all():
-            gdf = gdf.make_valid()
-
-        notna = gdf.notna()
-        if not notna.all():
-            gdf = gdf.loc[notna]
-
-        is_empty = gdf.is_empty
-        if is_empty.any():
-            gdf = gdf.loc[~is_empty]
-
+        geoms = gdf
     else:
         raise TypeError(f"'gdf' should be GeoDataFrame or GeoSeries, got {type(gdf)}")
 
+    arr = np.asarray(geoms.values)
+    is_missing = shapely.is_missing(arr)
+
+    # only repairing the invalid geometries. Missing geometries are not valid,
+    # but cannot be fixed
+    is_invalid = ~(shapely.is_valid(arr) | is_missing)
+    if is_invalid.any():
+        arr = arr.copy()
+        arr[is_invalid] = make_valid(arr[is_invalid])
+        geoms = GeoSeries(arr, index=geoms.index, crs=geoms.crs, name=geoms.name)
+        if isinstance(gdf, GeoDataFrame):
+            gdf.geometry = geoms
+        else:
+            gdf = geoms
+
+    # missing and empty geometries removed with one mask
+    is_missing |= shapely.is_empty(arr)
+    if is_missing.any():
+        gdf = gdf.iloc[~is_missing]
+
     if ignore_index:
         gdf = gdf.reset_index(drop=True)
 
@@ -394,9 +395,7 @@ def random_points(n: int, loc: float | int = 0.5) -> GeoDataFrame:
     x = np.random.rand(n) * float(loc) * 2
     y = np.random.rand(n) * float(loc) * 2
 
-    return GeoDataFrame(
-        (Point(x, y) for x, y in zip(x, y, strict=True)), columns=["geometry"]
-    )
+    return GeoDataFrame({"geometry": points(x, y)})
 
 
 def to_lines(*gdfs: GeoDataFrame, copy: bool = True) -> GeoDataFrame:
@@ -456,37 +455,18 @@ def to_lines(*gdfs: GeoDataFrame, copy: bool = True) -> GeoDataFrame:
     if any(gdf.geom_type.isin(["Point", "MultiPoint"]).any() for gdf in gdfs):
         raise ValueError("Cannot convert points to lines.")
 
-    def _shapely_geometry_to_lines(geom):
-        """Get all lines from the exterior and interiors of a Polygon."""
-
-        # if lines (points are not allowed in this function)
-        if geom.area == 0:
-            return geom
-
-        singlepart = get_parts(geom)
-        lines = []
-        for part in singlepart:
-            exterior_ring = get_exterior_ring(part)
-            lines.append(exterior_ring)
-
-            n_interior_rings = get_num_interior_rings(part)
-            if not (n_interior_rings):
-                continue
-
-            interior_rings = [
-                LineString(get_interior_ring(part, n)) for n in range(n_interior_rings)
-            ]
-
-            lines += interior_rings
-
-        return unary_union(lines)
-
     lines = []
     for gdf in gdfs:
+        # with more than one GeoDataFrame, the overlay makes new frames anyway,
+        # so only the returned single GeoDataFrame needs to own its data
         if copy:
-            gdf = gdf.copy()
+            gdf = gdf.copy(deep=len(gdfs) == 1)
 
-        gdf.geometry = gdf.geometry.map(_shapely_geometry_to_lines)
+        gdf.geometry = GeoSeries(
+            _shapely_geometry_to_lines(np.asarray(gdf.geometry.values)),
+            index=gdf.index,
+            crs=gdf.crs,
+        )
 
         gdf = to_single_geom_type(gdf, "line")
 
@@ -495,21 +475,74 @@ def to_lines(*gdfs: GeoDataFrame, copy: bool = True) -> GeoDataFrame:
     if len(lines) == 1:
         return lines[0]
 
-    if len(lines[0]) and len(lines[1]):
-        unioned = lines[0].overlay(lines[1], how="union", keep_geom_type=True)
-    else:
-        unioned = pd.concat([lines[0], lines[1]], ignore_index=True)
-
-    if len(lines) > 2:
-        for line_gdf in lines[2:]:
-            if len(line_gdf):
-                unioned = unioned.overlay(line_gdf, how="union", keep_geom_type=True)
-            else:
-                unioned = pd.concat([unioned, line_gdf], ignore_index=True)
+    # overlay instead of one unary_union to keep the columns of overlapping lines
+    unioned = lines[0]
+    for line_gdf in lines[1:]:
+        if len(unioned) and len(line_gdf):
+            unioned = unioned.overlay(line_gdf, how="union", keep_geom_type=True)
+        else:
+            unioned = pd.concat([unioned, line_gdf], ignore_index=True)
 
     return make_all_singlepart(unioned, ignore_index=True)
 
 
+def _shapely_geometry_to_lines(geoms: NDArray[Geometry]) -> NDArray[Geometry]:
+    """Get all lines from the exteriors and interiors of polygons.
+
+    The rings of all polygons are extracted at once, then unioned per geometry.
+    Geometries without area (lines) are returned as is.
+    """
+    # one vectorized area call to find the polygons. Lines and missing geometries
+    # are left untouched, and the array is only copied if there are polygons
+    has_area = area(geoms) > 0
+    if not has_area.any():
+        return geoms
+    geoms = geoms.copy()
+
+    parts, geom_idx = get_parts(geoms[has_area], return_index=True)
+
+    # the part and the number within the part of each interior ring
+    n_interior_rings = get_num_interior_rings(parts)
+    interior_part = np.repeat(np.arange(len(parts)), n_interior_rings)
+    interior_n = np.arange(len(interior_part)) - np.repeat(
+        np.cumsum(n_interior_rings) - n_interior_rings, n_interior_rings
+    )
+
+    rings = np.concatenate(
+        [
+            get_exterior_ring(parts),
+            get_interior_ring(parts[interior_part], interior_n),
+        ]
+    )
+    ring_part = np.concatenate([np.arange(len(parts)), interior_part])
+
+    # each part's exterior ring followed by its interior rings, part by part
+    order = np.argsort(ring_part, kind="stable")
+    rings = rings[order]
+    ring_geom_idx = geom_idx[ring_part[order]]
+
+    group_starts = np.flatnonzero(np.diff(ring_geom_idx, prepend=-1))
+    groups = np.split(rings, group_starts[1:])
+
+    # the union of a single ring is the ring itself, so it is only made into a line
+    first_rings = rings[group_starts]
+    is_single_ring = (
+        np.diff(group_starts, append=len(rings)) == 1
+    ) & ~shapely.is_missing(first_rings)
+    coords, coords_idx = get_coordinates(first_rings[is_single_ring], return_index=True)
+
+    lines = np.empty(len(groups), dtype=object)
+    lines[is_single_ring] = linestrings(coords, indices=coords_idx)
+    lines[~is_single_ring] = [
+        union_all(group)
+        for group, is_single in zip(groups, is_single_ring, strict=True)
+        if not is_single
+    ]
+    geoms[has_area] = lines
+
+    return geoms
+
+
 def clean_clip(
     gdf: GeoDataFrame | GeoSeries,
     mask: GeoDataFrame | GeoSeries | Geometry,
@@ -544,16 +577,16 @@ def clean_clip(
                 "Mixed geometry types is not allowed when keep_geom_type is True."
             )
 
-    try:
-        gdf = gdf.clip(mask, **kwargs).pipe(clean_geoms)
-    except Exception:
+    # cleaning invalid inputs up front instead of retrying after a failed clip
+    if not shapely.is_valid(np.asarray(gdf.geometry.values)).all():
         gdf = clean_geoms(gdf)
-        try:
+    if isinstance(mask, (GeoDataFrame, GeoSeries)):
+        if not shapely.is_valid(np.asarray(mask.geometry.values)).all():
             mask = clean_geoms(mask)
-        except TypeError:
-            mask = make_valid(mask)
+    elif isinstance(mask, Geometry) and not mask.is_valid:
+        mask = make_valid(mask)
 
-        return gdf.clip(mask, **kwargs).pipe(clean_geoms)
+    gdf = gdf.clip(mask, **kwargs).pipe(clean_geoms)
 
     if geom_type is not None or keep_geom_type:
         gdf = to_single_geom_type(gdf, geom_type)
@@ -352,12 +352,6 @@ def get_k_nearest_neighbors(
     if get_geom_type(gdf) != "point" or get_geom_type(neighbors) != "point":
         raise ValueError("Geometries must be points")
 
-    # using the range index
-    idx_dict_gdf = {i: col for i, col in zip(range(len(gdf)), gdf.index, strict=True)}
-    id_dict_neighbors = {
-        i: col for i, col in zip(range(len(neighbors)), neighbors.index, strict=True)
-    }
-
     gdf_array = coordinate_array(gdf)
     neighbors_array = coordinate_array(neighbors)
 
@@ -368,14 +362,14 @@ def get_k_nearest_neighbors(
     edges = edges[dists >= 0]
     dists = dists[dists >= 0]
 
-    df = DataFrame(edges, columns=["tmp__idx__", "neighbor_index"])
-
-    df["distance"] = dists
-
-    df["tmp__idx__"] = df["tmp__idx__"].map(idx_dict_gdf)
-    df["neighbor_index"] = df["neighbor_index"].map(id_dict_neighbors)
-
-    df = df.set_index("tmp__idx__")
+    # the edges are positions, so the index values are picked out by position
+    df = DataFrame(
+        {
+            "neighbor_index": neighbors.index.to_numpy()[edges[:, 1]],
+            "distance": dists,
+        },
+        index=gdf.index.to_numpy()[edges[:, 0]],
+    )
 
     df.index.name = gdf.index.name
 
@@ -415,6 +409,5 @@ def _get_edges(
     Returns:
       A 2d numpy array of edges (from-to indices).
     """
-    return np.array(
-        [[(i, neighbor) for neighbor in indices[i]] for i in range(len(gdf))]
-    )
+    from_indices = np.broadcast_to(np.arange(len(gdf))[:, np.newaxis], indices.shape)
+    return np.stack([from_indices, indices], axis=-1)
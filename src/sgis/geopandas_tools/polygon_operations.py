@@ -1,31 +1,38 @@
 """Functions for polygon geometries."""
 
-import networkx as nx
+import numba
 import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame, GeoSeries
 from shapely import (
+    Geometry,
+    STRtree,
     area,
+    boundary,
     box,
     buffer,
     difference,
     get_exterior_ring,
     get_interior_ring,
+    get_num_geometries,
     get_num_interior_rings,
-    get_parts,
+    intersection,
+    intersects,
     is_empty,
+    is_missing,
+    length,
     make_valid,
     polygons,
-    unary_union,
+    prepare,
+    union_all,
 )
-from shapely.errors import GEOSException
 
-from .general import _push_geom_col, clean_geoms, get_grouped_centroids, to_lines
+from .general import _push_geom_col, clean_geoms, get_grouped_centroids
 from .geometry_types import get_geom_type, make_all_singlepart, to_single_geom_type
 from .neighbors import get_neighbor_indices
 from .overlay import clean_overlay
 from .polygons_as_rings import PolygonsAsRings
-from .sfilter import sfilter, sfilter_inverse
+from .sfilter import sfilter
 
 
 def get_polygon_clusters(
@@ -38,7 +45,7 @@ def get_polygon_clusters(
     """Find which polygons overlap without dissolving.
 
     Devides polygons into clusters in a fast and precice manner by using spatial join
-    and networkx to find the connected components, i.e. overlapping geometries.
+    and union-find to get the connected components, i.e. overlapping geometries.
     If multiple GeoDataFrames are given, the clusters will be based on all
     combined.
 
@@ -120,72 +127,113 @@ def get_polygon_clusters(
         *gdfs, cluster_col = gdfs
 
     concated = []
-    orig_indices = ()
+    orig_indices = []
 
-    # take a copy only if there are gdfs with the same id
-    # To not get any overwriting in the for loop
-    if sum(df1 is df2 for df1 in gdfs for df2 in gdfs) > len(gdfs):
-        gdfs = [gdf.copy() for gdf in gdfs]
-
-    for i, gdf in enumerate(gdfs):
+    for gdf in gdfs:
         if isinstance(gdf, GeoSeries):
             gdf = gdf.to_frame()
 
         if not isinstance(gdf, GeoDataFrame):
             raise TypeError("'gdfs' should be GeoDataFrames or GeoSeries.")
 
-        if not allow_multipart and len(gdf) != len(gdf.explode(index_parts=False)):
+        if not allow_multipart and (get_num_geometries(gdf.geometry.values) > 1).any():
             raise ValueError(
                 "All geometries should be exploded to singlepart "
                 "in order to get correct polygon clusters. "
                 "To allow multipart geometries, set allow_multipart=True"
             )
 
-        orig_indices = orig_indices + (gdf.index,)
-
-        gdf = gdf.assign(i__=i)
-
+        orig_indices.append(gdf.index)
         concated.append(gdf)
 
+    # the number of the gdf of each row, added after concatenating so the gdfs are
+    # not copied to add the column
+    sizes = [len(gdf) for gdf in concated]
     concated = pd.concat(concated, ignore_index=True)
+    concated["i__"] = np.repeat(np.arange(len(sizes)), sizes)
 
     if not len(concated):
         return concated.drop("i__", axis=1).assign(**{cluster_col: []})
 
     neighbors = get_neighbor_indices(concated, concated, predicate=predicate)
 
-    edges = [(source, target) for source, target in neighbors.items()]
-
-    graph = nx.Graph()
-    graph.add_edges_from(edges)
-
-    component_mapper = {
-        j: i
-        for i, component in enumerate(nx.connected_components(graph))
-        for j in component
-    }
-
-    concated[cluster_col] = component_mapper
+    # the index is a RangeIndex, so the indices are also the positions
+    concated[cluster_col] = _get_component_labels(
+        neighbors.index.to_numpy(dtype=np.int64),
+        neighbors.to_numpy(dtype=np.int64),
+        len(concated),
+    )
 
     if as_string:
         concated[cluster_col] = get_grouped_centroids(concated, groupby=cluster_col)
 
     concated = _push_geom_col(concated)
 
-    n_gdfs = concated["i__"].unique()
+    n_gdfs = np.arange(len(sizes))
 
     if len(n_gdfs) == 1:
         concated.index = orig_indices[0]
         return concated.drop(["i__"], axis=1)
 
-    unconcated = ()
+    # the rows of each gdf are contiguous, so they are sliced out by their offsets
+    offsets = np.cumsum([0, *sizes])
+    unconcated = []
     for i in n_gdfs:
-        gdf = concated[concated["i__"] == i]
+        gdf = concated.iloc[offsets[i] : offsets[i + 1]].drop(["i__"], axis=1)
         gdf.index = orig_indices[i]
-        gdf = gdf.drop(["i__"], axis=1)
-        unconcated = unconcated + (gdf,)
+        unconcated.append(gdf)
+
+    return tuple(unconcated)
+
+
+@numba.njit(cache=True)
+def _find_root(parents: np.ndarray, i: int) -> int:
+    root = i
+    while parents[root] != root:
+        root = parents[root]
+
+    # path compression
+    while parents[i] != root:
+        parents[i], i = root, parents[i]
+
+    return root
+
+
+@numba.njit(cache=True)
+def _get_component_labels(
+    sources: np.ndarray, targets: np.ndarray, n: int
+) -> np.ndarray:
+    """Connected component labels of n nodes from the edges, with union-find.
+
+    The components are numbered by their lowest node, like networkx and scipy
+    would when the edges are sorted.
+    """
+    parents = np.arange(n)
+    sizes = np.ones(n, dtype=np.int64)
 
-    return unconcated
+    for k in range(len(sources)):
+        root1 = _find_root(parents, sources[k])
+        root2 = _find_root(parents, targets[k])
+        if root1 == root2:
+            continue
+
+        # the smaller tree is attached to the larger
+        if sizes[root1] < sizes[root2]:
+            root1, root2 = root2, root1
+        parents[root2] = root1
+        sizes[root1] += sizes[root2]
+
+    labels = np.empty(n, dtype=np.int64)
+    root_labels = np.full(n, -1, dtype=np.int64)
+    n_labels = 0
+    for i in range(n):
+        root = _find_root(parents, i)
+        if root_labels[root] == -1:
+            root_labels[root] = n_labels
+            n_labels += 1
+        labels[i] = root_labels[root]
+
+    return labels
 
 
 def eliminate_by_longest(
@@ -235,25 +283,34 @@ def eliminate_by_longest(
     gdf = gdf.reset_index(drop=True)
 
     gdf["poly_idx"] = gdf.index
-    to_eliminate = to_eliminate.assign(eliminate_idx=lambda x: range(len(x)))
-
-    # convert to lines to get the borders
-    lines_gdf = to_lines(gdf[["poly_idx", "geometry"]], copy=False)
-    lines_eliminate = to_lines(to_eliminate[["eliminate_idx", "geometry"]], copy=False)
-
-    borders = lines_gdf.overlay(lines_eliminate, keep_geom_type=True).loc[
-        lambda x: x["eliminate_idx"].notna()
-    ]
-
-    borders["_length"] = borders.length
+    to_eliminate = to_eliminate.copy(deep=False)
+    to_eliminate["eliminate_idx"] = np.arange(len(to_eliminate))
+
+    # the shared borders of the intersecting pairs, i.e. the lines where the
+    # boundaries overlap. Points where the polygons only touch get length 0
+    eliminate_geoms = to_eliminate.geometry.values
+    gdf_geoms = gdf.geometry.values
+    eliminate_idx, poly_idx = STRtree(gdf_geoms).query(
+        eliminate_geoms, predicate="intersects"
+    )
+    borders = pd.DataFrame(
+        {
+            "eliminate_idx": eliminate_idx,
+            "poly_idx": poly_idx,
+            "_length": length(
+                intersection(
+                    boundary(eliminate_geoms[eliminate_idx]),
+                    boundary(gdf_geoms[poly_idx]),
+                )
+            ),
+        }
+    ).loc[lambda x: x["_length"] > 0]
 
     # as DataFrame because GeoDataFrame constructor is expensive
-    borders = pd.DataFrame(borders)
     gdf = pd.DataFrame(gdf)
 
-    longest_border = borders.sort_values("_length", ascending=False).drop_duplicates(
-        "eliminate_idx"
-    )
+    # the first of the longest borders per polygon, without sorting all borders
+    longest_border = borders.loc[borders.groupby("eliminate_idx")["_length"].idxmax()]
 
     to_poly_idx = longest_border.set_index("eliminate_idx")["poly_idx"]
     to_eliminate["_dissolve_idx"] = to_eliminate["eliminate_idx"].map(to_poly_idx)
@@ -384,24 +441,41 @@ def _eliminate_by_area(
     gdf = make_all_singlepart(gdf).reset_index(drop=True)
     to_eliminate = make_all_singlepart(to_eliminate).reset_index(drop=True)
 
-    gdf["_area"] = gdf.area
+    gdf["_area"] = area(gdf.geometry.values)
     gdf["_dissolve_idx"] = gdf.index
 
-    if max_distance:
-        to_join = gdf[["_area", "_dissolve_idx", "geometry"]]
-        to_join.geometry = to_join.buffer(max_distance)
-        joined = to_eliminate.sjoin(to_join, predicate=predicate, how="left")
-    else:
-        joined = to_eliminate.sjoin(
-            gdf[["_area", "_dissolve_idx", "geometry"]], predicate=predicate, how="left"
-        )
+    # like a left sjoin, but with the pairs from one bulk tree query. The index is
+    # a RangeIndex, so the tree positions are also the _dissolve_idx values
+    join_geoms = (
+        gdf.buffer(max_distance).values if max_distance else gdf.geometry.values
+    )
+    eliminate_pos, dissolve_idx = STRtree(join_geoms).query(
+        to_eliminate.geometry.values, predicate=predicate
+    )
+
+    # the polygons without hits get one row with missing values
+    no_hits = np.setdiff1d(np.arange(len(to_eliminate)), eliminate_pos)
+    eliminate_pos = np.concatenate([eliminate_pos, no_hits])
+    dissolve_idx = np.concatenate([dissolve_idx, np.full(len(no_hits), -1)])
+    # the missing areas are appended last, so position -1 gives NaN
+    areas = np.append(gdf["_area"].to_numpy(), np.nan)[dissolve_idx]
+
+    # keeping the first hit per polygon after sorting by area. The pairs are
+    # first ordered like the sjoin output
+    order = np.lexsort((dissolve_idx, eliminate_pos))
+    order = order[
+        np.argsort(areas[order] if sort_ascending else -areas[order], kind="stable")
+    ]
+    _, first_hits = np.unique(eliminate_pos[order], return_index=True)
+    keep = order[np.sort(first_hits)]
 
     # as DataFrames because GeoDataFrame constructor is expensive
-    joined = (
-        pd.DataFrame(joined)
-        .drop(columns="index_right")
-        .sort_values("_area", ascending=sort_ascending)
-        .loc[lambda x: ~x.index.duplicated(keep="first")]
+    joined = pd.DataFrame(to_eliminate.iloc[eliminate_pos[keep]])
+    joined["_area"] = areas[keep]
+    joined["_dissolve_idx"] = (
+        np.where(dissolve_idx[keep] == -1, np.nan, dissolve_idx[keep])
+        if len(no_hits)
+        else dissolve_idx[keep]
     )
 
     gdf = pd.DataFrame(gdf)
@@ -450,30 +524,35 @@ def _eliminate(gdf, to_eliminate, aggfunc, crs, **kwargs):
     else:
         concatted = pd.concat([to_dissolve, to_eliminate])
 
+    # the group sizes are NaN for missing _dissolve_idx
+    group_sizes = concatted.groupby("_dissolve_idx")["_dissolve_idx"].transform("size")
+
     one_hit = concatted.loc[
-        lambda x: (x.groupby("_dissolve_idx").transform("size") == 1)
-        & (x["_dissolve_idx"].notna())
+        (group_sizes == 1) & (concatted["_dissolve_idx"].notna())
     ].set_index("_dissolve_idx")
 
     assert len(one_hit) == 0
 
-    many_hits = concatted.loc[
-        lambda x: x.groupby("_dissolve_idx").transform("size") > 1
-    ]
+    many_hits = concatted.loc[group_sizes > 1]
 
     if not len(many_hits):
         return one_hit
 
     kwargs.pop("as_index", None)
+    grouped = many_hits.groupby("_dissolve_idx", **kwargs)
+
     eliminated = (
-        many_hits.drop(columns="geometry")
-        .groupby("_dissolve_idx", **kwargs)
+        grouped[[col for col in many_hits if col not in ["_dissolve_idx", "geometry"]]]
         .agg(aggfunc)
         .drop(["_area"], axis=1, errors="ignore")
     )
 
-    eliminated["geometry"] = many_hits.groupby("_dissolve_idx")["geometry"].agg(
-        lambda x: make_valid(unary_union(x.values))
+    # union per group in GEOS, without a Python callback through groupby.agg
+    codes, uniques = pd.factorize(many_hits["_dissolve_idx"])
+    geoms = many_hits["geometry"].to_numpy()[np.argsort(codes, kind="stable")]
+    groups = np.split(geoms, np.cumsum(np.bincount(codes))[:-1])
+    eliminated["geometry"] = GeoSeries(
+        make_valid([union_all(group) for group in groups]), index=uniques
     )
 
     # setting crs on geometryarray to avoid warning in concat
@@ -592,13 +671,15 @@ def close_all_holes(
             return holes_closed
 
     all_geoms = make_valid(gdf.unary_union)
+    geoms = gdf.geometry.to_numpy() if isinstance(gdf, GeoDataFrame) else gdf.to_numpy()
+    holes, geom_idx = _get_holes_without_islands(geoms, all_geoms)
+    holes_closed = _union_with_holes(geoms, holes, geom_idx)
+
     if isinstance(gdf, GeoDataFrame):
-        gdf.geometry = gdf.geometry.map(
-            lambda x: _close_all_holes_no_islands(x, all_geoms)
-        )
+        gdf.geometry = holes_closed
         return gdf
     else:
-        return gdf.map(lambda x: _close_all_holes_no_islands(x, all_geoms))
+        return GeoSeries(holes_closed, index=gdf.index, crs=gdf.crs)
 
 
 def _close_thin_holes(
@@ -706,32 +787,34 @@ def close_small_holes(
 
     if not ignore_islands:
         all_geoms = make_valid(gdf.unary_union)
+        geoms = (
+            gdf.geometry.to_numpy() if isinstance(gdf, GeoDataFrame) else gdf.to_numpy()
+        )
+        holes, geom_idx = _get_holes_without_islands(geoms, all_geoms)
+        is_small = area(holes) < max_area
+        holes_closed = _union_with_holes(geoms, holes[is_small], geom_idx[is_small])
 
         if isinstance(gdf, GeoDataFrame):
-            gdf.geometry = gdf.geometry.map(
-                lambda x: _close_small_holes_no_islands(x, max_area, all_geoms)
-            )
+            gdf.geometry = holes_closed
             return gdf
         else:
-            return gdf.map(
-                lambda x: _close_small_holes_no_islands(x, max_area, all_geoms)
-            )
+            return GeoSeries(holes_closed, index=gdf.index, crs=gdf.crs)
     else:
         geoms = (
             gdf.geometry.to_numpy() if isinstance(gdf, GeoDataFrame) else gdf.to_numpy()
         )
-        exteriors = get_exterior_ring(geoms)
-        assert len(exteriors) == len(geoms)
-
-        max_rings = max(get_num_interior_rings(geoms))
+        # numpy max instead of the builtin, which loops over the array in Python
+        max_rings = get_num_interior_rings(geoms).max(initial=0)
 
         if not max_rings:
             return gdf
 
-        # looping through max for all geoms since arrays must be equal length
-        interiors = np.array(
-            [[get_interior_ring(geom, i) for i in range(max_rings)] for geom in geoms]
-        )
+        exteriors = get_exterior_ring(geoms)
+        assert len(exteriors) == len(geoms)
+
+        # getting max_rings rings for all geoms since arrays must be equal length.
+        # Broadcasting to a 2d array of shape (n geoms, max_rings) in one call
+        interiors = get_interior_ring(geoms[:, np.newaxis], np.arange(max_rings))
         assert interiors.shape == (len(geoms), max_rings), interiors.shape
 
         areas = area(polygons(interiors))
@@ -746,52 +829,47 @@ def close_small_holes(
             return GeoSeries(results, crs=gdf.crs)
 
 
-def _close_small_holes_no_islands(poly, max_area, all_geoms):
-    """Closes small holes within one shapely geometry of polygons."""
-
-    # start with a list containing the polygon,
-    # then append all holes smaller than 'max_km2' to the list.
-    holes_closed = [poly]
-    singlepart = get_parts(poly)
-    for part in singlepart:
-        n_interior_rings = get_num_interior_rings(part)
-
-        if not (n_interior_rings):
-            continue
-
-        for n in range(n_interior_rings):
-            hole = polygons(get_interior_ring(part, n))
-            try:
-                no_islands = unary_union(hole.difference(all_geoms))
-            except GEOSException:
-                no_islands = make_valid(unary_union(hole.difference(all_geoms)))
+def _get_holes_without_islands(
+    geoms: np.ndarray, all_geoms: Geometry
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get the holes of singlepart polygons as polygons, minus 'all_geoms'.
 
-            if area(no_islands) < max_area:
-                holes_closed.append(no_islands)
-
-    return make_valid(unary_union(holes_closed))
+    The holes of all polygons are extracted and differenced at once. Returns the
+    holes and the position of the polygon each hole belongs to.
+    """
+    n_interior_rings = get_num_interior_rings(geoms)
+    geom_idx = np.repeat(np.arange(len(geoms)), n_interior_rings)
+    ring_n = np.arange(len(geom_idx)) - np.repeat(
+        np.cumsum(n_interior_rings) - n_interior_rings, n_interior_rings
+    )
 
+    holes = polygons(get_interior_ring(geoms[geom_idx], ring_n))
 
-def _close_all_holes_no_islands(poly, all_geoms):
-    """Closes all holes within one shapely geometry of polygons."""
+    return difference(holes, all_geoms), geom_idx
 
-    # start with a list containing the polygon,
-    # then append all holes smaller than 'max_km2' to the list.
-    holes_closed = [poly]
-    singlepart = get_parts(poly)
-    for part in singlepart:
-        n_interior_rings = get_num_interior_rings(part)
 
-        for n in range(n_interior_rings):
-            hole = polygons(get_interior_ring(part, n))
-            try:
-                no_islands = unary_union(hole.difference(all_geoms))
-            except GEOSException:
-                no_islands = make_valid(unary_union(hole.difference(all_geoms)))
+def _union_with_holes(
+    geoms: np.ndarray, holes: np.ndarray, geom_idx: np.ndarray
+) -> np.ndarray:
+    """Union each polygon with its holes, then make valid.
 
-            holes_closed.append(no_islands)
+    The polygons without holes are unioned alone in one vectorized call.
+    """
+    has_holes = np.isin(np.arange(len(geoms)), geom_idx)
+
+    results = np.empty(len(geoms), dtype=object)
+    results[~has_holes] = union_all(geoms[~has_holes, np.newaxis], axis=1)
+    if not has_holes.any():
+        return make_valid(results)
+
+    # holes are ordered by polygon, so they can be split into one group per polygon
+    hole_groups = np.split(holes, np.flatnonzero(np.diff(geom_idx)) + 1)
+    results[has_holes] = [
+        union_all(np.append(geom, group))
+        for geom, group in zip(geoms[has_holes], hole_groups, strict=True)
+    ]
 
-    return make_valid(unary_union(holes_closed))
+    return make_valid(results)
 
 
 def get_gaps(gdf: GeoDataFrame, include_interiors: bool = False) -> GeoDataFrame:
@@ -819,10 +897,12 @@ def get_gaps(gdf: GeoDataFrame, include_interiors: bool = False) -> GeoDataFrame
         clean_overlay(bbox, gdf, how="difference", geom_type="polygon")
     )
 
-    # remove the outer "gap", i.e. the surrounding area
-    return sfilter_inverse(gaps, get_exterior_ring(bbox.geometry.values)).reset_index(
-        drop=True
-    )
+    # remove the outer "gap", i.e. the surrounding area. It is the only gap touching
+    # the bbox ring, so the gaps are tested against the prepared ring directly
+    # instead of building a spatial index of the ring
+    ring = get_exterior_ring(bbox.geometry.values[0])
+    prepare(ring)
+    return gaps.loc[~intersects(gaps.geometry.values, ring)].reset_index(drop=True)
 
 
 def get_holes(gdf: GeoDataFrame, as_polygons=True) -> GeoDataFrame:
@@ -850,13 +930,22 @@ def get_holes(gdf: GeoDataFrame, as_polygons=True) -> GeoDataFrame:
         else make_all_singlepart(gdf).to_numpy()
     )
 
-    rings = [
-        GeoSeries(astype(get_interior_ring(geoms, i)), crs=gdf.crs)
-        for i in range(max(get_num_interior_rings(geoms)))
-    ]
+    max_rings = get_num_interior_rings(geoms).max(initial=0)
+    if not max_rings:
+        return GeoDataFrame({"geometry": []}, crs=gdf.crs)
+
+    # all interior rings at once, one row per polygon and one column per ring
+    rings = get_interior_ring(geoms[:, np.newaxis], np.arange(max_rings))
+    is_ring = ~is_missing(rings)
+
+    # flattening row by row keeps the rings sorted by polygon, then by ring number
+    polygon_idx = np.repeat(np.arange(len(geoms)), max_rings).reshape(rings.shape)
+    polygon_idx = polygon_idx[is_ring]
 
-    return (
-        GeoDataFrame({"geometry": (pd.concat(rings).pipe(clean_geoms).sort_index())})
-        if rings
-        else GeoDataFrame({"geometry": []}, crs=gdf.crs)
+    return GeoDataFrame(
+        {
+            "geometry": GeoSeries(
+                astype(rings[is_ring]), index=polygon_idx, crs=gdf.crs
+            ).pipe(clean_geoms)
+        }
     )
@@ -1,4 +1,5 @@
 """Small helper functions."""
+import functools
 import glob
 import inspect
 import os
@@ -81,7 +82,10 @@ def dict_zip(*dicts):
         yield key, first_val, *(other[key] for other in dicts[1:])
 
 
+# cached, since the environment does not change while running
+@functools.cache
 def in_jupyter():
+    """Returns True if running in a Jupyter/IPython kernel."""
     try:
         get_ipython
         return True
@@ -161,19 +165,9 @@ def get_object_name(var: object, n: int = 5) -> str | None:
         names = [
             var_name for var_name, var_val in frame.f_locals.items() if var_val is var
         ]
-        if names and len(names) == 1:
-            return names[0]
-
-        names = [name for name in names if not name.startswith("_")]
-
-        if names and len(names) == 1:
-            return names[0]
-
-        if names and len(names) > 1:
-            warnings.warn(
-                "More than one local variable matches the object. Name might be wrong."
-            )
-            return names[0]
+        name = _pick_object_name(names)
+        if name:
+            return name
 
         frame = frame.f_back
 
@@ -181,15 +175,56 @@ def get_object_name(var: object, n: int = 5) -> str | None:
             return
 
 
-def make_namedict(gdfs: tuple[GeoDataFrame]) -> dict[int, str]:
+def _pick_object_name(names: list[str]) -> str | None:
+    if names and len(names) == 1:
+        return names[0]
+
+    names = [name for name in names if not name.startswith("_")]
+
+    if names and len(names) == 1:
+        return names[0]
+
+    if names and len(names) > 1:
+        warnings.warn(
+            "More than one local variable matches the object. Name might be wrong."
+        )
+        return names[0]
+
+
+def make_namedict(gdfs: tuple[GeoDataFrame], n: int = 5) -> dict[int, str]:
+    """Like get_object_name, but the frames are searched once for all gdfs."""
     namedict = {}
+    positions_by_id: dict[int, list[int]] = {}
     for i, gdf in enumerate(gdfs):
         if hasattr(gdf, "name"):
             namedict[i] = gdf.name
         else:
-            name = get_object_name(gdf) or str(i)
-            namedict[i] = name
-    return namedict
+            positions_by_id.setdefault(id(gdf), []).append(i)
+
+    frame = inspect.currentframe().f_back
+
+    for _ in range(n):
+        if not positions_by_id or not frame:
+            break
+
+        names_by_id = {id_: [] for id_ in positions_by_id}
+        for var_name, var_val in frame.f_locals.items():
+            if id(var_val) in names_by_id:
+                names_by_id[id(var_val)].append(var_name)
+
+        for id_, names in names_by_id.items():
+            name = _pick_object_name(names)
+            if name:
+                for i in positions_by_id.pop(id_):
+                    namedict[i] = name
+
+        frame = frame.f_back
+
+    for positions in positions_by_id.values():
+        for i in positions:
+            namedict[i] = str(i)
+
+    return dict(sorted(namedict.items()))
 
 
 def sort_nans_last(df, ignore_index: bool = False):
@@ -15,16 +15,17 @@ import matplotlib
 import numpy as np
 import pandas as pd
 from folium import plugins
-from geopandas import GeoDataFrame
+from geopandas import GeoDataFrame, GeoSeries
 from IPython.display import display
 from jinja2 import Template
-from shapely import Geometry
+from shapely import Geometry, buffer, intersection, is_empty, union_all
 from shapely.geometry import LineString
 
 from ..geopandas_tools.conversion import to_gdf
 from ..geopandas_tools.general import clean_geoms, make_all_singlepart
 from ..geopandas_tools.geometry_types import get_geom_type, to_single_geom_type
 from ..helpers import unit_is_degrees
+from ..parallel.parallel import Parallel
 from .httpserver import run_html_server
 from .map import Map
 
@@ -130,13 +131,14 @@ class Explore(Map):
         new_gdfs, show_new = [], []
         for gdf, show in zip(self.gdfs, self.show, strict=True):
             for col in gdf.columns:
-                if not len(gdf.loc[gdf[col].notna()]):
+                # only the column is filtered, not the whole frame
+                notna = gdf[col].dropna()
+                if not len(notna):
                     continue
-                if not isinstance(
-                    gdf.loc[gdf[col].notna(), col].iloc[0], (Number, str, Geometry)
-                ) or (
+                first_value = notna.iloc[0]
+                if not isinstance(first_value, (Number, str, Geometry)) or (
                     col != gdf._geometry_column_name
-                    and isinstance(gdf.loc[gdf[col].notna(), col].iloc[0], (Geometry))
+                    and isinstance(first_value, (Geometry))
                 ):
                     try:
                         gdf[col] = gdf[col].astype(str)
@@ -216,7 +218,7 @@ class Explore(Map):
 
         # convert lines to polygons
         if get_geom_type(sample) == "line":
-            sample["geometry"] = sample.buffer(1)
+            sample[sample.geometry.name] = buffer(sample.geometry.values, 1)
 
         if get_geom_type(sample) == "polygon":
             random_point = sample.sample_points(size=1)
@@ -228,10 +230,7 @@ class Explore(Map):
         self.center = (random_point.geometry.iloc[0].x, random_point.geometry.iloc[0].y)
         print(f"center={self.center}, size={size}")
 
-        gdfs: tuple[GeoDataFrame] = ()
-        for gdf in self._gdfs:
-            gdf = gdf.clip(random_point.buffer(size))
-            gdfs = gdfs + (gdf,)
+        gdfs = _clip_to_mask(self._gdfs, random_point.buffer(size))
         self._gdfs = gdfs
         self._gdf = pd.concat(gdfs, ignore_index=True)
 
@@ -249,15 +248,15 @@ class Explore(Map):
             self._update_column()
             kwargs.pop("column", None)
 
-        gdfs: tuple[GeoDataFrame] = ()
+        gdfs: list[GeoDataFrame] = []
         for gdf in self._gdfs:
             gdf = gdf.clip(mask)
             collections = gdf.loc[gdf.geom_type == "GeometryCollection"]
             if len(collections):
                 collections = make_all_singlepart(collections)
                 gdf = pd.concat([gdf, collections], ignore_index=False)
-            gdfs = gdfs + (gdf,)
-        self._gdfs = gdfs
+            gdfs.append(gdf)
+        self._gdfs = tuple(gdfs)
         self._gdf = pd.concat(gdfs, ignore_index=True)
         self._explore(**kwargs)
 
@@ -830,3 +829,69 @@ def _categorical_legend(m, title, categories, colors):
     # Add Body
     body = bc.element.Element(body, "legend")
     m.get_root().html.add_child(body)
+
+
+def _clip_to_mask(
+    gdfs: tuple[GeoDataFrame | GeoSeries], mask: GeoDataFrame | GeoSeries | Geometry
+) -> tuple[GeoDataFrame | GeoSeries]:
+    """Clip all gdfs with one vectorized intersection.
+
+    The geometries of all gdfs are intersected with the unioned mask at once,
+    then split back into one GeoDataFrame or GeoSeries per input.
+    """
+    # a single mask geometry, like the buffered location masks, is used as is
+    if isinstance(mask, (GeoDataFrame, GeoSeries)) and len(mask) == 1:
+        mask = mask.geometry.iloc[0]
+    elif isinstance(mask, (GeoDataFrame, GeoSeries)):
+        mask = union_all(mask.geometry.values)
+    elif not isinstance(mask, Geometry):
+        return tuple(gdf.clip(mask) for gdf in gdfs)
+
+    if not gdfs:
+        return ()
+
+    # candidates from the spatial index of each layer. geopandas keeps the index on
+    # the frame, so re-running clipmap with the same data does not rebuild the trees
+    positions = [
+        np.sort(gdf.sindex.query(mask, predicate="intersects")) for gdf in gdfs
+    ]
+    candidates = np.concatenate(
+        [np.asarray(gdf.geometry.values)[pos] for gdf, pos in zip(gdfs, positions)]
+    )
+    intersected = np.split(
+        _intersection_in_threads(candidates, mask),
+        np.cumsum([len(pos) for pos in positions])[:-1],
+    )
+
+    clipped: list[GeoDataFrame | GeoSeries] = []
+    for gdf, pos, geoms in zip(gdfs, positions, intersected):
+        is_clipped = ~is_empty(geoms)
+        pos = pos[is_clipped]
+        clipped_geoms = GeoSeries(geoms[is_clipped], index=gdf.index[pos], crs=gdf.crs)
+        if isinstance(gdf, GeoSeries):
+            clipped.append(clipped_geoms.rename(gdf.name))
+        else:
+            clipped_ = gdf.iloc[pos].copy()
+            clipped_[gdf.geometry.name] = clipped_geoms
+            clipped.append(clipped_)
+
+    return tuple(clipped)
+
+
+def _intersection_in_threads(geoms: np.ndarray, mask: Geometry) -> np.ndarray:
+    """Intersect many geometries with the mask in chunks, one per thread.
+
+    shapely releases the GIL while intersecting, and threads share the mask
+    without copying it. Small inputs are intersected in one call, since starting
+    the threads would take longer.
+    """
+    processes = min(os.cpu_count() or 1, len(geoms) // 10_000)
+    if processes < 2:
+        return intersection(geoms, mask)
+
+    chunks = np.array_split(geoms, processes)
+    return np.concatenate(
+        Parallel(processes, backend="threading").map(
+            intersection, chunks, kwargs=dict(b=mask)
+        )
+    )
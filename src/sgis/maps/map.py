@@ -2,6 +2,7 @@
 
 This module holds the Map class, which is the basis for the Explore class.
 """
+import hashlib
 import warnings
 
 import matplotlib
@@ -51,6 +52,50 @@ _CATEGORICAL_CMAP = {
 DEFAULT_SCHEME = "quantiles"
 
 
+def _get_hex_colors(cmap: str, positions: np.ndarray) -> list[str]:
+    """Hex colors at integer positions of a cmap, looked up in one call."""
+    rgba = matplotlib.colormaps.get_cmap(cmap)(positions)
+    return [colors.to_hex(color) for color in rgba]
+
+
+# the raw bins of the most recently classified value arrays. The key is a digest of
+# the values, not their identity or min/max, so changed data is never given old bins
+_BINS_CACHE: dict[tuple, list[float]] = {}
+_BINS_CACHE_SIZE = 32
+
+
+def _get_raw_bins(values: np.ndarray, scheme: str, k: int) -> list[float]:
+    """Class breaks from jenks_breaks or mapclassify, cached by the content of values.
+
+    Repeated maps of the same column, e.g. from calling qtm or explore again, then
+    skip the classification, which is slow for large arrays.
+    """
+    if values.dtype == object:
+        return _classify(values, scheme, k)
+
+    values = np.ascontiguousarray(values)
+    digest = hashlib.blake2b(values, digest_size=16).digest()
+    key = (digest, values.dtype.str, scheme, k)
+    try:
+        return list(_BINS_CACHE[key])
+    except KeyError:
+        pass
+
+    bins = _classify(values, scheme, k)
+
+    if len(_BINS_CACHE) >= _BINS_CACHE_SIZE:
+        del _BINS_CACHE[next(iter(_BINS_CACHE))]
+    _BINS_CACHE[key] = list(bins)
+
+    return bins
+
+
+def _classify(values: np.ndarray, scheme: str, k: int) -> list[float]:
+    if scheme == "jenks":
+        return list(jenks_breaks(values, n_classes=k))
+    return list(classify(values, scheme=scheme, k=k).bins)
+
+
 def proper_fillna(val, fill_val):
     """fillna doesn't always work. So doing it manually."""
     try:
@@ -299,7 +344,7 @@ class Map:
     ) -> tuple[tuple[GeoDataFrame], str]:
         """Separate GeoDataFrames from string (column argument)."""
 
-        gdfs: tuple[GeoDataFrame] = ()
+        gdfs: list[GeoDataFrame] = []
         for arg in args:
             if isinstance(arg, str):
                 if column is None:
@@ -309,9 +354,9 @@ class Map:
                         "Can specify at most one string as a positional argument."
                     )
             elif isinstance(arg, (GeoDataFrame, GeoSeries, Geometry)):
-                gdfs = gdfs + (arg,)
+                gdfs.append(arg)
 
-        return gdfs, column
+        return tuple(gdfs), column
 
     def _prepare_continous_map(self):
         """Create bins if not already done and adjust k if needed."""
@@ -359,7 +404,8 @@ class Map:
         for gdf in gdfs:
             gdf = gdf.reset_index(drop=True)
             gdf = drop_inactive_geometry_columns(gdf).pipe(rename_geometry_if)
-            if crs_list:
+            # to_crs copies the frame even when the crs is the same
+            if crs_list and not (gdf.crs and gdf.crs.is_exact_same(self.crs)):
                 try:
                     gdf = gdf.to_crs(self.crs)
                 except ValueError:
@@ -398,7 +444,6 @@ class Map:
             1 if any(x in self._column for x in ["meter", "metre", "leng"]) else 0
         )
 
-        all_nan = 0
         col_not_present = 0
         for gdf in self._gdfs:
             if self._column not in gdf:
@@ -411,8 +456,6 @@ class Map:
                 else:
                     col_not_present += 1
             elif not pd.api.types.is_numeric_dtype(gdf[self._column]):
-                if all(gdf[self._column].isna()):
-                    all_nan += 1
                 return True
 
         if maybe_area > 1:
@@ -422,9 +465,6 @@ class Map:
             self._column = "length"
             return False
 
-        if all_nan == len(self._gdfs):
-            raise ValueError(f"All values are NaN in column {self.column!r}.")
-
         if col_not_present == len(self._gdfs):
             raise ValueError(f"{self.column} not found.")
 
@@ -437,22 +477,15 @@ class Map:
                 category: _CATEGORICAL_CMAP[i]
                 for i, category in enumerate(self._unique_values)
             }
-        elif self._cmap:
-            cmap = matplotlib.colormaps.get_cmap(self._cmap)
-
-            self._categories_colors_dict = {
-                category: colors.to_hex(cmap(int(i)))
-                for i, category in enumerate(self._unique_values)
-            }
         else:
-            cmap = matplotlib.colormaps.get_cmap("tab20")
-
-            self._categories_colors_dict = {
-                category: colors.to_hex(cmap(int(i)))
-                for i, category in enumerate(self._unique_values)
-            }
+            hex_colors = _get_hex_colors(
+                self._cmap or "tab20", np.arange(len(self._unique_values))
+            )
+            self._categories_colors_dict = dict(
+                zip(self._unique_values, hex_colors, strict=True)
+            )
 
-        if any(self._nan_idx):
+        if self._nan_idx.any():
             self._gdf[self._column] = self._gdf[self._column].fillna(self.nan_label)
             self._categories_colors_dict[self.nan_label] = self.nan_color
 
@@ -473,7 +506,9 @@ class Map:
         much faster than the one from Mapclassifier.
         """
 
-        if not len(gdf.loc[~self._nan_idx, column]):
+        values = np.asarray(gdf.loc[~self._nan_idx, column])
+
+        if not len(values):
             return np.array([0])
 
         n_classes = (
@@ -490,19 +525,12 @@ class Map:
 
         if self.scheme == "jenks":
             try:
-                bins = jenks_breaks(
-                    gdf.loc[~self._nan_idx, column], n_classes=n_classes
-                )
+                bins = _get_raw_bins(values, self.scheme, n_classes)
                 bins = self._add_minmax_to_bins(bins)
             except Exception:
                 pass
         else:
-            binning = classify(
-                np.asarray(gdf.loc[~self._nan_idx, column]),
-                scheme=self.scheme,
-                k=self._k,
-            )
-            bins = binning.bins
+            bins = _get_raw_bins(values, self.scheme, self._k)
             bins = self._add_minmax_to_bins(bins)
 
         unique_bins = list({round(bin, 5) for bin in bins})
@@ -536,13 +564,12 @@ class Map:
         return self
 
     def _get_continous_colors(self, n: int) -> np.ndarray:
-        cmap = matplotlib.colormaps.get_cmap(self._cmap)
-        colors_ = [
-            colors.to_hex(cmap(int(i)))
-            #            for i in np.linspace(self.cmap_start, self.cmap_stop, num=self._k)
-            for i in np.linspace(self.cmap_start, self.cmap_stop, num=n)
-        ]
-        if any(self._nan_idx):
+        colors_ = _get_hex_colors(
+            self._cmap,
+            #            np.linspace(self.cmap_start, self.cmap_stop, num=self._k)
+            np.linspace(self.cmap_start, self.cmap_stop, num=n).astype(int),
+        )
+        if self._nan_idx.any():
             colors_ = colors_ + [self.nan_color]
         return np.array(colors_)
 
@@ -12,15 +12,16 @@ import warnings
 from numbers import Number
 from typing import Any
 
+import numpy as np
 from geopandas import GeoDataFrame, GeoSeries
-from shapely import Geometry
+from shapely import Geometry, get_type_id
 
 from ..geopandas_tools.conversion import to_gdf as to_gdf_func
 from ..geopandas_tools.general import clean_clip, clean_geoms, is_wkt
 from ..geopandas_tools.geocoding import address_to_gdf
 from ..geopandas_tools.geometry_types import get_geom_type
 from ..helpers import make_namedict
-from .explore import Explore
+from .explore import Explore, _clip_to_mask
 from .map import Map
 from .thematicmap import ThematicMap
 
@@ -174,7 +175,7 @@ def explore(
         return
 
     if not kwargs.pop("explore", True):
-        return qtm(m._gdf, column=m.column, cmap=m._cmap, k=m.k)
+        return _qtm_from_map(m)
 
     m.explore()
 
@@ -287,28 +288,25 @@ def samplemap(
             **kwargs,
         )
 
-        if sample_from_first:
-            sample = m._gdfs[0].sample(1)
-        else:
-            sample = m._gdf.sample(1)
-
-        # convert lines to polygons
-        if get_geom_type(sample) == "line":
-            sample["geometry"] = sample.buffer(1)
-
-        if get_geom_type(sample) == "polygon":
-            random_point = sample.sample_points(size=1)
+        sample_from = m._gdfs[0] if sample_from_first else m._gdf
+        sample = sample_from.geometry.values[np.random.randint(len(sample_from))]
 
+        # (multi)linestrings and linearrings, then (multi)polygons
+        type_id = get_type_id(sample)
+        if type_id in (1, 2, 5):
+            random_point = sample.interpolate(np.random.random(), normalized=True)
+        elif type_id in (3, 6):
+            random_point = GeoSeries([sample]).sample_points(size=1).iloc[0]
         # if point or mixed geometries
         else:
             random_point = sample.centroid
 
-        center = (random_point.geometry.iloc[0].x, random_point.geometry.iloc[0].y)
+        center = (random_point.x, random_point.y)
         print(f"center={center}, size={size}")
 
-        m._gdf = m._gdf.clip(random_point.buffer(size))
+        (m._gdf,) = _clip_to_mask((m._gdf,), random_point.buffer(size))
 
-        qtm(m._gdf, column=m.column, cmap=m._cmap, k=m.k)
+        _qtm_from_map(m)
 
 
 def _prepare_clipmap(*gdfs, mask, labels, **kwargs):
@@ -324,17 +322,7 @@ def _prepare_clipmap(*gdfs, mask, labels, **kwargs):
         namedict = make_namedict(gdfs)
         kwargs["namedict"] = namedict
 
-    clipped: tuple[GeoDataFrame] = ()
-
-    if mask is not None:
-        for gdf in gdfs:
-            clipped_ = gdf.clip(mask)
-            clipped = clipped + (clipped_,)
-
-    else:
-        for gdf in gdfs[:-1]:
-            clipped_ = gdf.clip(gdfs[-1])
-            clipped = clipped + (clipped_,)
+    clipped = _clip_to_mask(gdfs, mask)
 
     if not any(len(gdf) for gdf in clipped):
         warnings.warn("None of the GeoDataFrames are within the mask extent.")
@@ -426,7 +414,7 @@ def clipmap(
             labels=labels,
             **kwargs,
         )
-        qtm(m._gdf, column=m.column, cmap=m._cmap, k=m.k)
+        _qtm_from_map(m)
 
 
 def explore_locals(*gdfs, to_gdf: bool = True, **kwargs):
@@ -473,6 +461,11 @@ def explore_locals(*gdfs, to_gdf: bool = True, **kwargs):
     explore(*gdfs, **local_gdfs, **kwargs)
 
 
+def _qtm_from_map(m: Map) -> None:
+    """Static plot of an Explore or Map instance, for when explore is False."""
+    qtm(m._gdf, column=m.column, cmap=m._cmap, k=m.k)
+
+
 def qtm(
     *gdfs: GeoDataFrame,
     column: str | None = None,
@@ -1,51 +1,40 @@
 import warnings
 
+import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame
 from igraph import Graph
 from pandas import DataFrame
 
+from ..parallel.parallel import Parallel
+
 
 def _get_route_frequencies(
     graph,
     roads: GeoDataFrame,
     weight_df: DataFrame,
+    processes: int = 1,
 ) -> GeoDataFrame:
     """Function used in the get_route_frequencies method of NetworkAnalysis."""
     warnings.filterwarnings("ignore", category=RuntimeWarning)
 
-    resultlist: list[DataFrame] = []
-
-    od_pairs = weight_df.index
-
-    for ori_id in od_pairs.get_level_values(0).unique():
-        relevant_pairs = od_pairs[od_pairs.get_level_values(0) == ori_id]
-        destinations = relevant_pairs.get_level_values(1)
-
-        res = graph.get_shortest_paths(
-            weights="weight", v=ori_id, to=destinations, output="epath"
-        )
-
-        for i, des_id in enumerate(destinations):
-            indices = graph.es[res[i]]
-
-            if not indices:
-                continue
-
-            line_ids = DataFrame({"src_tgt_wt": indices["src_tgt_wt"]})
-            line_ids["origin"] = ori_id
-            line_ids["destination"] = des_id
-            line_ids["multiplier"] = weight_df.loc[ori_id, des_id].iloc[0]
+    paths = _get_path_edge_ids(graph, weight_df.index, processes=processes)
 
-            resultlist.append(line_ids)
-
-    if not resultlist:
+    if not paths:
         return pd.DataFrame(columns=["frequency", "geometry"])
 
-    summarised: pd.Series = (
-        pd.concat(resultlist).groupby("src_tgt_wt")["multiplier"].sum()
+    multipliers = [weight_df.loc[ori_id, des_id].iloc[0] for ori_id, des_id, _ in paths]
+    line_ids = DataFrame(
+        {
+            "src_tgt_wt": [edge_id for *_, edge_ids in paths for edge_id in edge_ids],
+            "multiplier": np.repeat(
+                multipliers, [len(edge_ids) for *_, edge_ids in paths]
+            ),
+        }
     )
 
+    summarised: pd.Series = line_ids.groupby("src_tgt_wt")["multiplier"].sum()
+
     roads["frequency"] = roads["src_tgt_wt"].map(summarised)
 
     roads_visited = roads.loc[roads["frequency"].notna()].drop("src_tgt_wt", axis=1)
@@ -58,44 +47,115 @@ def _get_route(
     weight: str,
     roads: GeoDataFrame,
     od_pairs: pd.MultiIndex,
+    processes: int = 1,
 ) -> GeoDataFrame:
     """Function used in the get_route method of NetworkAnalysis."""
 
     warnings.filterwarnings("ignore", category=RuntimeWarning)
 
-    resultlist: list[DataFrame] = []
+    paths = _get_path_edge_ids(graph, od_pairs, processes=processes)
 
-    for ori_id in od_pairs.get_level_values(0).unique():
-        relevant_pairs = od_pairs[od_pairs.get_level_values(0) == ori_id]
-        destinations = relevant_pairs.get_level_values(1)
+    if not paths:
+        warnings.warn(
+            "No paths were found. Try larger search_tolerance or search_factor. "
+            "Or close_network_holes() or remove_isolated()."
+        )
+        return pd.DataFrame(columns=["origin", "destination", weight, "geometry"])
 
-        res = graph.get_shortest_paths(
-            weights="weight", v=ori_id, to=destinations, output="epath"
+    results: DataFrame = _create_line_id_df(paths)
+    assert list(results.columns) == ["origin", "destination"], list(results.columns)
+    lines: GeoDataFrame = _get_line_geometries(results, roads, weight)
+    lines = lines.dissolve(by=["origin", "destination"], aggfunc="sum", as_index=False)
+
+    return lines[["origin", "destination", weight, "geometry"]]
+
+
+def _get_path_edge_ids(
+    graph: Graph, od_pairs: pd.MultiIndex, processes: int = 1
+) -> list[tuple[str, str, list[str]]]:
+    """Origin, destination and edge ids ('src_tgt_wt') of each shortest path.
+
+    Pairs without a path are left out. Like in the cost matrix of od_cost_matrix,
+    the origins are split between processes, not threads, since igraph holds the
+    GIL while finding the paths.
+    """
+    origins = od_pairs.get_level_values(0).unique()
+
+    if processes > 1 and len(origins) > processes:
+        chunks = [
+            od_pairs[od_pairs.get_level_values(0).isin(chunk)]
+            for chunk in np.array_split(np.asarray(origins), processes)
+        ]
+        paths = Parallel(processes, backend="loky").map(
+            _get_path_edge_ids_one_process, chunks, kwargs=dict(graph=graph)
         )
+        return [path for chunk_paths in paths for path in chunk_paths]
+
+    return _get_path_edge_ids_one_process(od_pairs, graph)
+
+
+def _get_path_edge_ids_one_process(
+    od_pairs: pd.MultiIndex, graph: Graph
+) -> list[tuple[str, str, list[str]]]:
+    ori_ids = od_pairs.get_level_values(0)
+    des_ids = od_pairs.get_level_values(1)
+
+    # one shortest path search from each origin or, if there are fewer
+    # destinations, one backwards search from each destination
+    if des_ids.nunique() < ori_ids.nunique():
+        edge_paths = _get_edge_paths_to_destinations(graph, ori_ids, des_ids)
+    else:
+        edge_paths = _get_edge_paths_from_origins(graph, ori_ids, des_ids)
 
-        for i, des_id in enumerate(destinations):
-            indices = graph.es[res[i]]
+    paths: list[tuple[str, str, list[str]]] = []
+
+    for ori_id in ori_ids.unique():
+        for des_id in des_ids[ori_ids == ori_id]:
+            indices = graph.es[edge_paths[ori_id, des_id]]
 
             if not indices:
                 continue
 
-            line_ids = _create_line_id_df(indices["src_tgt_wt"], ori_id, des_id)
+            paths.append((ori_id, des_id, indices["src_tgt_wt"]))
 
-            resultlist.append(line_ids)
+    return paths
 
-    if not resultlist:
-        warnings.warn(
-            "No paths were found. Try larger search_tolerance or search_factor. "
-            "Or close_network_holes() or remove_isolated()."
+
+def _get_edge_paths_from_origins(
+    graph: Graph, ori_ids: pd.Index, des_ids: pd.Index
+) -> dict[tuple[str, str], list[int]]:
+    edge_paths: dict[tuple[str, str], list[int]] = {}
+
+    for ori_id in ori_ids.unique():
+        destinations = des_ids[ori_ids == ori_id].unique()
+
+        res = graph.get_shortest_paths(
+            weights="weight", v=ori_id, to=destinations, output="epath"
         )
-        return pd.DataFrame(columns=["origin", "destination", weight, "geometry"])
 
-    results: DataFrame = pd.concat(resultlist)
-    assert list(results.columns) == ["origin", "destination"], list(results.columns)
-    lines: GeoDataFrame = _get_line_geometries(results, roads, weight)
-    lines = lines.dissolve(by=["origin", "destination"], aggfunc="sum", as_index=False)
+        for des_id, path in zip(destinations, res, strict=True):
+            edge_paths[ori_id, des_id] = path
 
-    return lines[["origin", "destination", weight, "geometry"]]
+    return edge_paths
+
+
+def _get_edge_paths_to_destinations(
+    graph: Graph, ori_ids: pd.Index, des_ids: pd.Index
+) -> dict[tuple[str, str], list[int]]:
+    edge_paths: dict[tuple[str, str], list[int]] = {}
+
+    for des_id in des_ids.unique():
+        origins = ori_ids[des_ids == des_id].unique()
+
+        res = graph.get_shortest_paths(
+            weights="weight", v=des_id, to=origins, output="epath", mode="in"
+        )
+
+        # the backwards paths start at the destination
+        for ori_id, path in zip(origins, res, strict=True):
+            edge_paths[ori_id, des_id] = path[::-1]
+
+    return edge_paths
 
 
 def _get_k_routes(
@@ -109,23 +169,23 @@ def _get_k_routes(
     """Function used in the get_k_routes method of NetworkAnalysis."""
     warnings.filterwarnings("ignore", category=RuntimeWarning)
 
-    resultlist: list[DataFrame] = []
+    paths: list[tuple[str, str, list[str]]] = []
+    path_k: list[int] = []
 
     for ori_id, des_id in od_pairs:
-        k_lines: DataFrame = _loop_k_routes(
-            graph, ori_id, des_id, k, drop_middle_percent
-        )
-        if k_lines is not None:
-            resultlist.append(k_lines)
+        k_routes = _loop_k_routes(graph, ori_id, des_id, k, drop_middle_percent)
+        for i, edge_ids in enumerate(k_routes):
+            paths.append((ori_id, des_id, edge_ids))
+            path_k.append(i + 1)
 
-    if not resultlist:
+    if not len(od_pairs):
         warnings.warn(
             "No paths were found. Try larger search_tolerance or search_factor. "
             "Or close_network_holes() or remove_isolated()."
         )
         return pd.DataFrame(columns=["origin", "destination", weight, "geometry"])
 
-    results: DataFrame = pd.concat(resultlist)
+    results: DataFrame = _create_line_id_df(paths, k=path_k)
 
     assert list(results.columns) == ["origin", "destination", "k"], list(
         results.columns
@@ -145,34 +205,34 @@ def _loop_k_routes(
     des_id: str,
     k: int,
     drop_middle_percent: int,
-) -> DataFrame:
+) -> list[list[str]]:
     """Workaround for igraph's get_k_shortest_paths.
 
     igraph's get_k_shorest_paths doesn't seem to work (gives just the same path k
     times), so doing it manually. Run _get_one_route, then remove the edges in the
     middle of the route, given with drop_middle_percent, repeat k times.
+
+    The edges are removed by giving them infinite weight in a copy of the weights,
+    instead of deleting them from a copy of the whole graph.
     """
-    graph = graph.copy()
+    weights: list[float] = graph.es["weight"]
 
-    lines: list[DataFrame] = []
+    routes: list[list[str]] = []
 
-    for i in range(k):
+    for _ in range(k):
         res = graph.get_shortest_paths(
-            weights="weight", v=ori_id, to=des_id, output="epath"
+            weights=weights, v=ori_id, to=des_id, output="epath"
         )
-        if not res[0]:
-            continue
-
-        indices = graph.es[res[0]]
+        edge_path: list[int] = res[0]
 
-        line_ids = _create_line_id_df(indices["src_tgt_wt"], ori_id, des_id)
-        line_ids["k"] = i + 1
-        lines.append(line_ids)
+        # igraph still returns a path when it can only go through removed edges
+        if not edge_path or any(np.isinf(weights[edge]) for edge in edge_path):
+            continue
 
-        edge_tuples = indices["edge_tuples"]
+        routes.append(graph.es[edge_path]["src_tgt_wt"])
 
         n_edges_to_keep = (
-            len(edge_tuples) - len(edge_tuples) * drop_middle_percent / 100
+            len(edge_path) - len(edge_path) * drop_middle_percent / 100
         ) / 2
 
         n_edges_to_keep = int(round(n_edges_to_keep, 0))
@@ -180,13 +240,10 @@ def _loop_k_routes(
         if n_edges_to_keep == 0:
             n_edges_to_keep = 1
 
-        to_be_dropped = edge_tuples[n_edges_to_keep:-n_edges_to_keep]
-        graph.delete_edges(to_be_dropped)
+        for edge in edge_path[n_edges_to_keep:-n_edges_to_keep]:
+            weights[edge] = np.inf
 
-    if lines:
-        return pd.concat(lines)
-    else:
-        return pd.DataFrame(columns=["origin", "destination", "k"])
+    return routes
 
 
 def _get_line_geometries(
@@ -197,13 +254,26 @@ def _get_line_geometries(
     return GeoDataFrame(line_ids, geometry="geometry", crs=roads.crs)
 
 
-def _create_line_id_df(src_tgt_wt: list, ori_id: str, des_id: str) -> DataFrame:
-    line_ids = DataFrame(index=src_tgt_wt)
-
-    # remove edges from ori/des to the roads
-    line_ids = line_ids.loc[~line_ids.index.str.endswith("_0")]
+def _create_line_id_df(
+    paths: list[tuple[str, str, list[str]]], **path_values: list
+) -> DataFrame:
+    """One row per edge of the paths, with the edge ids ('src_tgt_wt') as index.
 
-    line_ids["origin"] = ori_id
-    line_ids["destination"] = des_id
+    The columns are made from flat arrays in one go, not as one frame per path.
+    'path_values' are additional columns, given with one value per path.
+    """
+    n_edges = [len(edge_ids) for *_, edge_ids in paths]
+    ori_ids = np.array([ori_id for ori_id, *_ in paths], dtype=object)
+    des_ids = np.array([des_id for _, des_id, _ in paths], dtype=object)
+
+    line_ids = DataFrame(
+        {
+            "origin": np.repeat(ori_ids, n_edges),
+            "destination": np.repeat(des_ids, n_edges),
+            **{key: np.repeat(values, n_edges) for key, values in path_values.items()},
+        },
+        index=[edge_id for *_, edge_ids in paths for edge_id in edge_ids],
+    )
 
-    return line_ids
+    # remove edges from ori/des to the roads
+    return line_ids.loc[~line_ids.index.str.endswith("_0")]
@@ -1,10 +1,13 @@
 import geopandas as gpd
+import numba
 import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame
 from igraph import Graph
 from pandas import DataFrame
-from shapely import shortest_line
+from shapely import shortest_line, to_wkb
+
+from ..parallel.parallel import Parallel
 
 
 def _od_cost_matrix(
@@ -15,56 +18,286 @@ def _od_cost_matrix(
     *,
     lines: bool = False,
     rowwise: bool = False,
+    cutoff: int | float | None = None,
+    destination_count: int | None = None,
+    processes: int = 1,
 ) -> DataFrame | GeoDataFrame:
     assert origins.index.name == "temp_idx"
     assert destinations.index.name == "temp_idx"
 
-    results = _get_od_df(graph, origins.index, destinations.index, weight)
+    # integer codes of the origin and destination geometries, used to give the
+    # origin-destination pairs with identical geometries a cost of 0
+    ori_codes, des_codes = _get_geometry_codes(origins, destinations)
+
+    # the identical geometries and the cutoff are handled on the cost arrays, before
+    # the results are made into a DataFrame
+    get_od_df = _get_rowwise_od_df if rowwise else _get_od_df
+    results, ori_pos, des_pos = get_od_df(
+        graph,
+        origins.index,
+        destinations.index,
+        weight,
+        ori_codes=ori_codes,
+        des_codes=des_codes,
+        cutoff=cutoff,
+        processes=processes,
+    )
+
+    # filtering before making the lines, so they are only made for the kept rows
+    if destination_count:
+        results = results.loc[
+            _get_lowest_costs_mask(
+                results["origin"].to_numpy(),
+                results[weight].to_numpy(),
+                destination_count,
+            )
+        ]
 
-    # calculating all-to-all distances is much faster than looping rowwise,
-    # so filtering to rowwise afterwards instead
-    if rowwise:
-        rowwise_df = DataFrame(
-            {
-                "origin": origins.index,
-                "destination": destinations.index,
-            }
+    # straight lines between origin and destination. The positions of the origins
+    # and destinations are aligned with the unfiltered RangeIndex of the results
+    if lines:
+        results["geometry"] = shortest_line(
+            origins.geometry.values[ori_pos[results.index]],
+            destinations.geometry.values[des_pos[results.index]],
         )
-        results = rowwise_df.merge(results, on=["origin", "destination"], how="left")
+        results = gpd.GeoDataFrame(results, geometry="geometry", crs=25833, copy=False)
 
-    results["wkt_ori"] = results["origin"].map(origins.geometry)
-    results["wkt_des"] = results["destination"].map(destinations.geometry)
+    return results
 
-    results.loc[results.wkt_ori == results.wkt_des, weight] = 0
 
-    # straight lines between origin and destination
-    if lines:
-        results["geometry"] = shortest_line(results["wkt_ori"], results["wkt_des"])
-        results = gpd.GeoDataFrame(results, geometry="geometry", crs=25833)
+def _get_geometry_codes(
+    origins: GeoDataFrame, destinations: GeoDataFrame
+) -> tuple[np.ndarray, np.ndarray]:
+    """Integer codes that are equal for identical origin and destination geometries.
 
-    results = results.drop(["wkt_ori", "wkt_des"], axis=1, errors="ignore")
+    Missing geometries get the code -1.
+    """
+    wkbs = np.concatenate(
+        [to_wkb(origins.geometry.values), to_wkb(destinations.geometry.values)]
+    )
+    codes, _ = pd.factorize(wkbs)
+    return codes[: len(origins)], codes[len(origins) :]
 
-    return results.reset_index(drop=True)
 
+def _get_cost_matrix(
+    graph: Graph, origins: list[str], destinations: list[str], processes: int = 1
+) -> np.ndarray:
+    """2d array of the costs from each origin (rows) to each destination (columns).
 
-def _get_od_df(graph, origins, destinations, weight_col):
+    igraph holds the GIL while calculating distances, so the origins are split
+    between processes, not threads. Each process gets a pickled copy of the graph,
+    so this only pays off for many origins.
+    """
+    if processes > 1 and len(origins) > processes:
+        chunks = [
+            list(chunk) for chunk in np.array_split(np.asarray(origins), processes)
+        ]
+        cost_matrices = Parallel(processes, backend="loky").map(
+            _get_cost_matrix_one_process,
+            chunks,
+            kwargs=dict(graph=graph, destinations=destinations),
+        )
+        return np.vstack(cost_matrices)
+
+    return _get_cost_matrix_one_process(origins, graph, destinations)
+
+
+def _get_cost_matrix_one_process(
+    origins: list[str], graph: Graph, destinations: list[str]
+) -> np.ndarray:
     distances: list[list[float]] = graph.distances(
         weights="weight",
         source=origins,
         target=destinations,
     )
 
-    ori_idx, des_idx, costs = [], [], []
-    for i, f_idx in enumerate(origins):
-        for j, t_idx in enumerate(destinations):
-            ori_idx.append(f_idx)
-            des_idx.append(t_idx)
-            costs.append(distances[i][j])
+    return np.asarray(distances, dtype=np.float64).reshape(
+        len(origins), len(destinations)
+    )
 
-    return (
-        pd.DataFrame(
-            data={"origin": ori_idx, "destination": des_idx, weight_col: costs}
-        )
-        .replace([np.inf, -np.inf], np.nan)
-        .reset_index(drop=True)
+
+def _get_od_df(
+    graph,
+    origins,
+    destinations,
+    weight_col,
+    ori_codes,
+    des_codes,
+    cutoff,
+    processes: int = 1,
+):
+    costs = _get_cost_matrix(
+        graph, list(origins), list(destinations), processes=processes
+    )
+
+    ori_pos, des_pos, costs = _od_matrix_to_long(
+        costs,
+        ori_codes,
+        des_codes,
+        cutoff=np.inf if cutoff is None else float(cutoff),
+        keep_all=cutoff is None,
     )
+
+    results = pd.DataFrame(
+        data={
+            "origin": np.asarray(origins)[ori_pos],
+            "destination": np.asarray(destinations)[des_pos],
+            weight_col: costs,
+        },
+        copy=False,
+    )
+
+    return results, ori_pos, des_pos
+
+
+@numba.njit(parallel=True, cache=True)
+def _od_matrix_to_long(
+    costs: np.ndarray,
+    ori_codes: np.ndarray,
+    des_codes: np.ndarray,
+    cutoff: float,
+    keep_all: bool,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cost matrix to positions and costs of the origin-destination pairs to keep.
+
+    Pairs with identical geometries get a cost of 0 and infinite costs are set
+    to NaN. If not 'keep_all', only pairs with a cost of 'cutoff' or lower are kept.
+    The rows are counted in a first pass to allocate the output arrays, which are
+    then filled in a second pass.
+    """
+    n_ori, n_des = costs.shape
+
+    counts = np.zeros(n_ori, dtype=np.int64)
+    for i in numba.prange(n_ori):
+        count = 0
+        for j in range(n_des):
+            if ori_codes[i] == des_codes[j] and ori_codes[i] != -1:
+                cost = 0.0
+            else:
+                cost = costs[i, j]
+            if keep_all or cost <= cutoff:
+                count += 1
+        counts[i] = count
+
+    offsets = np.zeros(n_ori + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+
+    ori_pos = np.empty(offsets[-1], dtype=np.int64)
+    des_pos = np.empty(offsets[-1], dtype=np.int64)
+    out_costs = np.empty(offsets[-1], dtype=np.float64)
+
+    for i in numba.prange(n_ori):
+        k = offsets[i]
+        for j in range(n_des):
+            if ori_codes[i] == des_codes[j] and ori_codes[i] != -1:
+                cost = 0.0
+            else:
+                cost = costs[i, j]
+            if keep_all or cost <= cutoff:
+                ori_pos[k] = i
+                des_pos[k] = j
+                out_costs[k] = cost if np.isfinite(cost) else np.nan
+                k += 1
+
+    return ori_pos, des_pos, out_costs
+
+
+def _get_lowest_costs_mask(
+    origins: np.ndarray, costs: np.ndarray, destination_count: int
+) -> np.ndarray:
+    """Boolean mask of the rows with the 'destination_count' lowest costs per origin.
+
+    Gives the same result as groupby("origin")[cost].rank() <= destination_count,
+    but the origins must come in contiguous runs, as they do in both the
+    all-to-all and the rowwise results.
+    """
+    if not len(costs):
+        return np.zeros(0, dtype=bool)
+
+    is_first_in_group = np.concatenate([[True], origins[1:] != origins[:-1]])
+    offsets = np.append(np.flatnonzero(is_first_in_group), len(costs))
+
+    return _lowest_costs_mask(offsets, costs, destination_count)
+
+
+@numba.njit(parallel=True, cache=True)
+def _lowest_costs_mask(
+    offsets: np.ndarray, costs: np.ndarray, destination_count: int
+) -> np.ndarray:
+    """Sorts the costs of each origin separately instead of all costs by group.
+
+    Tied costs get their average rank and NaNs are not ranked, like in pandas.
+    """
+    mask = np.zeros(len(costs), dtype=np.bool_)
+
+    for group in numba.prange(len(offsets) - 1):
+        start = offsets[group]
+        group_costs = costs[start : offsets[group + 1]]
+
+        # NaNs are sorted last
+        order = np.argsort(group_costs)
+        n_not_nan = 0
+        for cost in group_costs:
+            if not np.isnan(cost):
+                n_not_nan += 1
+
+        # loop through runs of tied costs, from position i to j in the sorted order
+        i = 0
+        while i < n_not_nan:
+            j = i
+            while (
+                j + 1 < n_not_nan and group_costs[order[j + 1]] == group_costs[order[i]]
+            ):
+                j += 1
+
+            average_rank = (i + j + 2) / 2
+            if average_rank > destination_count:
+                break
+
+            for k in range(i, j + 1):
+                mask[start + order[k]] = True
+
+            i = j + 1
+
+    return mask
+
+
+def _get_rowwise_od_df(
+    graph,
+    origins,
+    destinations,
+    weight_col,
+    ori_codes,
+    des_codes,
+    cutoff,
+    processes: int = 1,
+):
+    # calculating all-to-all distances in one call is much faster than looping
+    # rowwise, so picking out the rowwise pairs from the matrix afterwards instead
+    unique_ori, ori_inverse = np.unique(np.asarray(origins), return_inverse=True)
+    unique_des, des_inverse = np.unique(np.asarray(destinations), return_inverse=True)
+
+    costs = _get_cost_matrix(
+        graph, unique_ori.tolist(), unique_des.tolist(), processes=processes
+    )[ori_inverse, des_inverse]
+
+    costs[(ori_codes == des_codes) & (ori_codes != -1)] = 0
+
+    # unreachable destinations have infinite cost
+    costs[~np.isfinite(costs)] = np.nan
+
+    # the n-th origin goes to the n-th destination
+    positions = np.arange(len(costs))
+    if cutoff is not None:
+        positions = positions[costs <= cutoff]
+
+    results = pd.DataFrame(
+        data={
+            "origin": np.asarray(origins)[positions],
+            "destination": np.asarray(destinations)[positions],
+            weight_col: costs[positions],
+        },
+        copy=False,
+    )
+
+    return results, positions, positions
@@ -1,4 +1,5 @@
 import numpy as np
+import pandas as pd
 from geopandas import GeoDataFrame
 
 from ..geopandas_tools.neighbors import get_k_nearest_neighbors
@@ -35,6 +36,18 @@ class Points:
             for temp_idx, idx in zip(self.gdf.temp_idx, self.gdf.index, strict=True)
         }
 
+    def _get_original_index(self, temp_idx: pd.Series) -> np.ndarray | pd.Series:
+        """Map temporary ids back to the original index values.
+
+        Does the same as temp_idx.map(self.idx_dict), but the ids are looked up in
+        an Index of the temporary ids and the original values are picked out by
+        position, without making a Series from the dict first.
+        """
+        positions = pd.Index(self.gdf["temp_idx"]).get_indexer(temp_idx)
+        if (positions == -1).any():
+            return temp_idx.map(self.idx_dict)
+        return self.gdf.index.to_numpy()[positions]
+
     @staticmethod
     def _convert_distance_to_weight(distances, rules):
         """Meters to minutes based on 'weight_to_nodes_' attribute of the rules."""
@@ -2,8 +2,10 @@
 
 import warnings
 
+import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame
+from shapely import length
 from shapely.constructive import reverse
 
 from ..helpers import return_two_vals, unit_is_meters
@@ -131,7 +133,7 @@ def make_directed_network(
             the coordinate reference system is not 'metre'.
     """
     _validate_minute_args(minute_cols, speed_col_kmh, flat_speed_kmh)
-    _validate_direction_args(gdf, direction_col, direction_vals_bft)
+    direction_codes = _validate_direction_args(gdf, direction_col, direction_vals_bft)
 
     if minute_cols is not None and any(x is None for x in [dropnegative, dropna]):
         raise ValueError(
@@ -149,8 +151,6 @@ def make_directed_network(
             "Change crs or calculate minutes manually."
         )
 
-    b, f, t = direction_vals_bft
-
     if minute_cols and minute_cols != "minutes" and minute_cols[0] != "minutes":
         gdf = gdf.drop("minutes", axis=1, errors="ignore")
 
@@ -163,31 +163,53 @@ def make_directed_network(
                 "values of directions forwards and backwards, in that order."
             ) from e
 
+        keep = np.full(len(gdf), True)
         if dropna:
-            gdf = gdf.loc[~((gdf[min_f].isna()) & (gdf[min_t].isna()))]
+            keep &= ~((gdf[min_f].isna()) & (gdf[min_t].isna())).to_numpy()
         if dropnegative:
-            gdf = gdf.loc[~((gdf[min_f] < 0) & (gdf[min_t] < 0))]
+            keep &= ~((gdf[min_f] < 0) & (gdf[min_t] < 0)).to_numpy()
 
-    # select the directional and bidirectional rows.
-    ft = gdf.loc[gdf[direction_col] == f]
-    tf = gdf.loc[gdf[direction_col] == t]
-    both_ways = gdf.loc[gdf[direction_col] == b]
-    both_ways2 = both_ways.copy()
+        if not keep.all():
+            gdf = gdf.iloc[keep]
+            direction_codes = direction_codes[keep]
 
-    if minute_cols:
-        # to single minute column
-        both_ways = both_ways.rename(columns={min_f: "minutes"}, errors="raise")
-        both_ways2 = both_ways2.rename(columns={min_t: "minutes"}, errors="raise")
+    # select the directional and bidirectional rows from the direction codes,
+    # which are 0, 1 and 2 for the values in 'direction_vals_bft'. Groups without
+    # rows are skipped, so already directed networks are not copied and reversed
+    n_both_ways, n_ft, n_tf = np.bincount(direction_codes, minlength=3)
+
+    if not minute_cols:
+        min_f, min_t = None, None
 
-        ft = ft.rename(columns={min_f: "minutes"}, errors="raise")
-        tf = tf.rename(columns={min_t: "minutes"}, errors="raise")
+    directed: list[GeoDataFrame] = []
 
-    both_ways2.geometry = reverse(both_ways2.geometry)
+    if n_both_ways:
+        both_ways = gdf.iloc[direction_codes == 0]
 
-    if reverse_tofrom:
-        tf.geometry = reverse(tf.geometry)
+        # shallow copy with new, reversed geometries. The other columns are not changed
+        both_ways2 = both_ways.copy(deep=False)
+        both_ways2.geometry = reverse(both_ways.geometry.values)
 
-    gdf = pd.concat([both_ways, both_ways2, ft, tf], ignore_index=True)
+        directed.append(_to_single_minute_col(both_ways, min_f))
+        directed.append(_to_single_minute_col(both_ways2, min_t))
+
+    if n_ft:
+        ft = gdf.iloc[direction_codes == 1]
+        directed.append(_to_single_minute_col(ft, min_f))
+
+    if n_tf:
+        tf = gdf.iloc[direction_codes == 2]
+        if reverse_tofrom:
+            tf = tf.copy(deep=False)
+            tf.geometry = reverse(tf.geometry.values)
+        directed.append(_to_single_minute_col(tf, min_t))
+
+    if len(directed) == 1:
+        gdf = directed[0].reset_index(drop=True)
+    elif directed:
+        gdf = pd.concat(directed, ignore_index=True, copy=False)
+    else:
+        gdf = _to_single_minute_col(gdf, min_f).reset_index(drop=True)
 
     if minute_cols and minute_cols != "minutes" and minute_cols[0] != "minutes":
         gdf = gdf.drop([min_f, min_t], axis=1, errors="ignore")
@@ -196,12 +218,18 @@ def make_directed_network(
         gdf = _get_speed_from_col(gdf, speed_col_kmh)
 
     if flat_speed_kmh:
-        meters_per_min = (flat_speed_kmh / 60) * 1000
-        gdf["minutes"] = gdf.length / meters_per_min
+        min_per_meter = 60 / (flat_speed_kmh * 1000)
+        gdf["minutes"] = length(gdf.geometry.values) * min_per_meter
 
     return gdf
 
 
+def _to_single_minute_col(gdf: GeoDataFrame, minute_col: str | None) -> GeoDataFrame:
+    if minute_col is None:
+        return gdf
+    return gdf.rename(columns={minute_col: "minutes"}, errors="raise")
+
+
 def _validate_minute_args(minute_cols, speed_col_kmh, flat_speed_kmh):
     if not minute_cols and not speed_col_kmh and not flat_speed_kmh:
         warnings.warn(
@@ -217,7 +245,13 @@ def _validate_minute_args(minute_cols, speed_col_kmh, flat_speed_kmh):
         )
 
 
-def _validate_direction_args(gdf, direction_col, direction_vals_bft):
+def _validate_direction_args(
+    gdf, direction_col, direction_vals_bft
+) -> np.ndarray[np.int8]:
+    """Checks the direction values and returns the direction column as codes.
+
+    The codes are 0, 1 and 2 for the values of 'direction_vals_bft', in that order.
+    """
     if len(direction_vals_bft) != 3:
         raise ValueError(
             "'direction_vals_bft' should be tuple/list with values of directions "
@@ -226,12 +260,19 @@ def _validate_direction_args(gdf, direction_col, direction_vals_bft):
 
     b, f, t = direction_vals_bft
 
-    if not all(gdf.loc[gdf[direction_col].isin(direction_vals_bft)]):
+    direction_codes = pd.Categorical(gdf[direction_col], categories=[b, f, t]).codes
+
+    if (direction_codes == -1).any():
+        bad_values = (
+            gdf[direction_col][direction_codes == -1]
+            .fillna("nan")
+            .astype(str)
+            .drop_duplicates()
+        )
         raise ValueError(
-            f"direction_col '{direction_col}' should have only three unique",
-            f"values. unique values in {direction_col}:",
-            ", ".join(gdf[direction_col].fillna("nan").unique()),
-            f"Got {direction_vals_bft}.",
+            f"direction_col '{direction_col}' should have only the values "
+            f"{direction_vals_bft}. Got the values {', '.join(bad_values)} "
+            f"in {direction_col}."
         )
 
     if "b" in t.lower() and "t" in b.lower() and "f" in f.lower():
@@ -241,13 +282,20 @@ def _validate_direction_args(gdf, direction_col, direction_vals_bft):
             stacklevel=2,
         )
 
+    return direction_codes
+
 
 def _get_speed_from_col(gdf: GeoDataFrame, speed_col_kmh: str) -> GeoDataFrame:
-    if len(gdf.loc[(gdf[speed_col_kmh].isna()) | (gdf[speed_col_kmh] == 0)]):
+    speed = gdf[speed_col_kmh].to_numpy(dtype=float, na_value=np.nan)
+
+    if (np.isnan(speed) | (speed == 0)).any():
         raise ValueError(
             f"speed_col_kmh {speed_col_kmh!r} cannot have missing values or zeros"
         )
 
-    gdf["minutes"] = gdf.length / (gdf[speed_col_kmh].astype(float) * 1000 / 60)
+    # minutes per meter
+    min_per_meter = 60 / (speed * 1000)
+
+    gdf["minutes"] = length(gdf.geometry.values) * min_per_meter
 
     return gdf
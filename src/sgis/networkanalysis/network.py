@@ -10,7 +10,7 @@ from copy import copy, deepcopy
 import numpy as np
 from geopandas import GeoDataFrame
 from pandas import DataFrame
-from shapely import line_merge
+from shapely import length, line_merge
 
 from ..exceptions import ZeroLinesError
 from ..geopandas_tools.general import clean_geoms
@@ -112,16 +112,28 @@ class Network:
     def _check_percent_bidirectional(self) -> int:
         """Road data often have to be duplicated and flipped to make it directed.
 
-        Here we check how.
+        Here we check how. The result is stored in the '_percent_bidirectional'
+        attribute upon instantiation, so it is not recalculated in the print
+        representation.
         """
-        self.gdf["meters"] = self.gdf.length.round(10).astype(str)
+        meters = self.gdf.length
+
+        # the length as string so that it can be sorted with the node ids
         no_dups = DataFrame(
-            np.sort(self.gdf[["source", "target", "meters"]].values, axis=1),
+            np.sort(
+                np.column_stack(
+                    [
+                        self.gdf["source"].values,
+                        self.gdf["target"].values,
+                        meters.round(10).astype(str).values,
+                    ]
+                ),
+                axis=1,
+            ),
             columns=[["source", "target", "meters"]],
         ).drop_duplicates()
 
-        # back to numeric
-        self.gdf["meters"] = self.gdf.length
+        self.gdf["meters"] = meters
 
         percent_bidirectional = len(self.gdf) / len(no_dups) * 100 - 100
 
@@ -217,7 +229,7 @@ class Network:
     def __repr__(self) -> str:
         """The print representation."""
         cl = self.__class__.__name__
-        km = int(sum(self.gdf.length) / 1000)
+        km = int(length(self.gdf.geometry.values).sum() / 1000)
         return f"{cl}({km} km, percent_bidirectional={self._percent_bidirectional})"
 
     def __iter__(self):
@@ -57,6 +57,11 @@ class NetworkAnalysis:
             all arguments passed to the analysis method, plus standard deviation and
             percentiles (25th, 50th, 75th) of the weight column in the results.
             Defaults to False.
+        processes: Number of parallel processes the origins are split between
+            when calculating travel costs in od_cost_matrix and finding the
+            paths in get_route and get_route_frequencies. Each process gets
+            a copy of the network graph, so this only pays off for large numbers
+            of origins. Defaults to 1.
 
     Attributes:
         network: A Network instance that holds the lines and nodes (points).
@@ -100,6 +105,7 @@ class NetworkAnalysis:
         rules: NetworkAnalysisRules | dict,
         log: bool = True,
         detailed_log: bool = False,
+        processes: int = 1,
     ):
         if not isinstance(rules, NetworkAnalysisRules):
             rules = NetworkAnalysisRules(**rules)
@@ -111,6 +117,7 @@ class NetworkAnalysis:
         self.rules = rules.copy()
         self._log = log
         self.detailed_log = detailed_log
+        self.processes = processes
 
         self._check_if_holes_are_nan()
 
@@ -131,14 +138,13 @@ class NetworkAnalysis:
             f"NaN values in the {self.rules.weight!r} column. Either remove NaNs "
             "or fill these values with a numeric value (e.g. 0)."
         )
+        if "hole" not in self.network.gdf:
+            return
+
+        is_hole = (self.network.gdf["hole"] == 1).to_numpy()
         if (
-            hasattr(self.network.gdf, "hole")
-            and len(self.network.gdf.loc[lambda x: x["hole"] == 1])
-            and (
-                self.network.gdf.loc[lambda x: x["hole"] == 1, self.rules.weight]
-                .isna()
-                .all()
-            )
+            is_hole.any()
+            and self.network.gdf.loc[is_hole, self.rules.weight].isna().all()
         ):
             raise ValueError(HOLES_ARE_NAN)
 
@@ -386,18 +392,15 @@ class NetworkAnalysis:
             weight=self.rules.weight,
             lines=lines,
             rowwise=rowwise,
+            cutoff=cutoff,
+            destination_count=destination_count,
+            processes=self.processes,
         )
 
-        if cutoff is not None:
-            results = results.loc[results[self.rules.weight] <= cutoff]
-
-        if destination_count:
-            results = results.loc[
-                results.groupby("origin")[self.rules.weight].rank() <= destination_count
-            ]
-
-        results["origin"] = results["origin"].map(self.origins.idx_dict)
-        results["destination"] = results["destination"].map(self.destinations.idx_dict)
+        results["origin"] = self.origins._get_original_index(results["origin"])
+        results["destination"] = self.destinations._get_original_index(
+            results["destination"]
+        )
 
         if lines:
             results = _push_geom_col(results)
@@ -617,6 +620,7 @@ class NetworkAnalysis:
             graph=self.graph,
             roads=self.network.gdf,
             weight_df=weight_df,
+            processes=self.processes,
         )
 
         if isinstance(results, GeoDataFrame):
@@ -720,6 +724,7 @@ class NetworkAnalysis:
             weight=self.rules.weight,
             roads=self.network.gdf,
             od_pairs=od_pairs,
+            processes=self.processes,
         )
 
         if cutoff is not None:
@@ -730,8 +735,10 @@ class NetworkAnalysis:
                 results.groupby("origin")[self.rules.weight].rank() <= destination_count
             ]
 
-        results["origin"] = results["origin"].map(self.origins.idx_dict)
-        results["destination"] = results["destination"].map(self.destinations.idx_dict)
+        results["origin"] = self.origins._get_original_index(results["origin"])
+        results["destination"] = self.destinations._get_original_index(
+            results["destination"]
+        )
 
         if self.rules.split_lines:
             self._unsplit_network()
@@ -895,8 +902,10 @@ class NetworkAnalysis:
                 results.groupby("origin")[self.rules.weight].rank() <= destination_count
             ]
 
-        results["origin"] = results["origin"].map(self.origins.idx_dict)
-        results["destination"] = results["destination"].map(self.destinations.idx_dict)
+        results["origin"] = self.origins._get_original_index(results["origin"])
+        results["destination"] = self.destinations._get_original_index(
+            results["destination"]
+        )
 
         if isinstance(results, GeoDataFrame):
             results = _push_geom_col(results)
@@ -1024,7 +1033,7 @@ class NetworkAnalysis:
                 missing["geometry"] = pd.NA
                 results = pd.concat([results, missing], ignore_index=True)
 
-            results["origin"] = results["origin"].map(self.origins.idx_dict)
+            results["origin"] = self.origins._get_original_index(results["origin"])
 
             results = _push_geom_col(results)
 
@@ -1153,7 +1162,7 @@ class NetworkAnalysis:
                 missing["geometry"] = pd.NA
                 results = pd.concat([results, missing], ignore_index=True)
 
-            results["origin"] = results["origin"].map(self.origins.idx_dict)
+            results["origin"] = self.origins._get_original_index(results["origin"])
             results = results.drop("origin", axis=1)
 
             results = _push_geom_col(results)
@@ -1365,12 +1374,21 @@ class NetworkAnalysis:
 
             edges, weights, ids = self._get_edges_and_weights()
 
-            self.graph = self._make_graph(
-                edges=edges,
-                weights=weights,
-                edge_ids=ids,
+            # the network edges come first, one per line. Only the edges to and from
+            # the points are added to a copy of the graph if the network is unchanged
+            n_lines = len(self.network.gdf)
+            self.graph = self._get_network_graph(
+                edges=edges[:n_lines],
+                weights=weights[:n_lines],
+                edge_ids=ids[:n_lines],
                 directed=self.rules.directed,
             )
+            self._add_edges_to_graph(
+                self.graph,
+                edges=edges[n_lines:],
+                weights=weights[n_lines:],
+                edge_ids=ids[n_lines:],
+            )
 
             self._add_missing_vertices()
 
@@ -1498,6 +1516,60 @@ class NetworkAnalysis:
                 ]
             )
 
+    def _get_network_graph(
+        self,
+        edges: list[tuple[str, str]],
+        weights: list[float],
+        edge_ids: list[str],
+        directed: bool,
+    ) -> Graph:
+        """Copy of the graph of the network lines, remade only if the lines changed.
+
+        The network is often unchanged between analyses with different origins and
+        destinations. Comparing the edge lists is much faster than making the graph.
+        """
+        key = (directed, edges, weights)
+
+        if getattr(self, "_network_graph_key", None) != key:
+            self._network_graph = self._make_graph(
+                edges=edges, weights=weights, edge_ids=edge_ids, directed=directed
+            )
+            self._network_graph_key = key
+
+        return self._network_graph.copy()
+
+    @staticmethod
+    def _add_edges_to_graph(
+        graph: Graph,
+        edges: list[tuple[str, str]],
+        weights: list[float],
+        edge_ids: list[str],
+    ) -> None:
+        """Adds edges and their new vertices in the same order as Graph.TupleList."""
+        if not edges:
+            return
+
+        if min(weights) < 0:
+            n = sum([1 for w in weights if w < 0])
+            raise ValueError(
+                f"The graph has been built with {n} negative weight values."
+            )
+
+        names = set(graph.vs["name"])
+        new_vertices = [name for edge in edges for name in edge if name not in names]
+        graph.add_vertices(list(dict.fromkeys(new_vertices)))
+
+        graph.add_edges(
+            edges,
+            attributes={
+                "weight": weights,
+                "src_tgt_wt": edge_ids,
+                "edge_tuples": edges,
+                "source": [edge[0] for edge in edges],
+                "target": [edge[1] for edge in edges],
+            },
+        )
+
     @staticmethod
     def _make_graph(
         edges: list[tuple[str, ...]] | np.ndarray[tuple[str, ...]],
@@ -1528,7 +1600,7 @@ class NetworkAnalysis:
         """Checks if the network or rules have changed.
 
         Returns False if the rules of the graphmaking has changed,
-        or if the points have changed.
+        or if the lines, their weights or the points have changed.
         """
         if not hasattr(self, "graph") or not hasattr(self, "wkts"):
             return False
@@ -1539,6 +1611,10 @@ class NetworkAnalysis:
         if self.network.gdf["src_tgt_wt"].isna().any():
             return False
 
+        # with split_lines, the graph is made from lines that are split at the points
+        if not self.rules.split_lines and self._network_has_changed():
+            return False
+
         for points in ["origins", "destinations"]:
             if self[points] is None:
                 continue
@@ -1549,6 +1625,15 @@ class NetworkAnalysis:
 
         return True
 
+    def _network_has_changed(self) -> bool:
+        """Check if the lines or weights have changed since the network graph was made."""
+        key = (
+            self.rules.directed,
+            self.network.get_edges(),
+            list(self.network.gdf[self.rules.weight]),
+        )
+        return getattr(self, "_network_graph_key", None) != key
+
     def _points_have_changed(self, points: GeoDataFrame, what: str) -> bool:
         """Check if the origins or destinations have changed.
 
@@ -3,6 +3,7 @@ import sys
 import warnings
 from pathlib import Path
 
+import geopandas as gpd
 import numpy as np
 import pandas as pd
 import pytest
@@ -372,9 +373,236 @@ def test_network_analysis(points_oslo, roads_oslo):
     not_test_direction(roads_oslo)
 
 
+def _synthetic_network_and_points():
+    """Three 100 meter lines in a row and points 10 meters from the nodes.
+
+    With nodedist_multiplier=1, the cost between points next to the line is
+    10 + 100 * (number of lines) + 10 meters. The points 10 and 14 are identical
+    and point 15 is too far from the lines to be reached.
+    """
+    from shapely.geometry import LineString, Point
+
+    lines = gpd.GeoDataFrame(
+        {"minutes": [1.0, 2.0, 3.0]},
+        geometry=[LineString([(x, 0), (x + 100, 0)]) for x in (0, 100, 200)],
+        crs=25833,
+    )
+    points = gpd.GeoDataFrame(
+        geometry=[
+            Point(100, 10),
+            Point(0, 10),
+            Point(200, 10),
+            Point(300, 10),
+            Point(100, 10),
+            Point(5000, 5000),
+        ],
+        index=[10, 11, 12, 13, 14, 15],
+        crs=25833,
+    )
+    return lines, points
+
+
+def _synthetic_rules(**kwargs):
+    return sg.NetworkAnalysisRules(
+        **{
+            "weight": "meters",
+            "directed": False,
+            "search_tolerance": 50,
+            "split_lines": False,
+            "nodedist_multiplier": 1,
+            **kwargs,
+        }
+    )
+
+
+def test_od_cost_matrix_synthetic():
+    lines, points = _synthetic_network_and_points()
+    nwa = sg.NetworkAnalysis(lines, rules=_synthetic_rules())
+
+    od = nwa.od_cost_matrix(points.iloc[:2], points)
+    print(od)
+
+    # one row per origin-destination pair, in the order of origins and destinations
+    assert list(od.origin) == [10] * 6 + [11] * 6, list(od.origin)
+    assert list(od.destination) == [10, 11, 12, 13, 14, 15] * 2, list(od.destination)
+
+    # identical geometries get cost 0 (not 20), the unreachable point gets NaN
+    assert od["meters"].tolist()[:5] == [0, 120, 120, 220, 0], od["meters"]
+    assert od["meters"].tolist()[6:11] == [120, 0, 220, 320, 120], od["meters"]
+    assert od.loc[od.destination == 15, "meters"].isna().all(), od
+    assert not od.loc[od.destination != 15, "meters"].isna().any(), od
+
+    # the costs keep full precision: the sum of the two connections and two lines
+    origin = sg.to_gdf((0, 10.123456789), crs=25833)
+    od_exact = nwa.od_cost_matrix(origin, points.loc[[12]])
+    assert od_exact["meters"].tolist() == [10.123456789 + 200 + 10], od_exact
+
+    # cutoff keeps the pairs with cost less than or equal to the cutoff, not NaN
+    od_cutoff = nwa.od_cost_matrix(points.iloc[:2], points, cutoff=120)
+    print(od_cutoff)
+    assert list(zip(od_cutoff.origin, od_cutoff.destination)) == [
+        (10, 10),
+        (10, 11),
+        (10, 12),
+        (10, 14),
+        (11, 10),
+        (11, 11),
+        (11, 14),
+    ], od_cutoff
+    assert od_cutoff["meters"].tolist() == [0, 120, 120, 0, 120, 0, 120], od_cutoff
+
+    od_lines = nwa.od_cost_matrix(points.iloc[:2], points, cutoff=120, lines=True)
+    assert od_lines[["origin", "destination", "meters"]].equals(od_cutoff), od_lines
+    assert (od_lines.length == [0, 100, 100, 0, 100, 0, 100]).all(), od_lines.length
+
+    rowwise = nwa.od_cost_matrix(points, points.iloc[::-1], rowwise=True)
+    print(rowwise)
+    assert list(rowwise.origin) == [10, 11, 12, 13, 14, 15], rowwise
+    assert list(rowwise.destination) == [15, 14, 13, 12, 11, 10], rowwise
+    assert rowwise["meters"].iloc[1:5].tolist() == [120, 120, 120, 120], rowwise
+    assert rowwise["meters"].iloc[[0, 5]].isna().all(), rowwise
+
+    rowwise_cutoff = nwa.od_cost_matrix(
+        points, points.iloc[::-1], rowwise=True, cutoff=100
+    )
+    assert not len(rowwise_cutoff), rowwise_cutoff
+
+
+def test_od_cost_matrix_destination_count_synthetic():
+    lines, points = _synthetic_network_and_points()
+    nwa = sg.NetworkAnalysis(lines, rules=_synthetic_rules())
+
+    od = nwa.od_cost_matrix(points, points)
+
+    def lowest_costs(od, destination_count):
+        """What destination_count should give. Tied costs get their average rank."""
+        rank = od.groupby("origin")["meters"].rank()
+        return od.loc[rank <= destination_count]
+
+    # origin 10 has the costs 0, 0 (identical points), 120, 120, 220 and NaN,
+    # so only destination_count 2 and 4 and higher avoid splitting the ties
+    for destination_count in [1, 2, 3, 4, 5, 6, 100]:
+        od_count = nwa.od_cost_matrix(
+            points, points, destination_count=destination_count
+        )
+        should_be = lowest_costs(od, destination_count)
+        assert od_count.equals(should_be), (destination_count, od_count, should_be)
+
+    od_count = nwa.od_cost_matrix(points, points, destination_count=1)
+    assert 10 not in od_count.origin.values, od_count
+    od_count = nwa.od_cost_matrix(points, points, destination_count=2)
+    assert od_count.loc[od_count.origin == 10, "destination"].tolist() == [10, 14]
+
+    # more destinations than there are: all non-NaN costs are kept
+    od_count = nwa.od_cost_matrix(points, points, destination_count=100)
+    assert od_count.equals(od.loc[od["meters"].notna()]), od_count
+
+    # the unreachable point only reaches itself
+    assert od_count.loc[od_count.origin == 15, "destination"].tolist() == [15]
+
+    # the costs to the other points are inf in igraph, NaN in the results
+    od_count = nwa.od_cost_matrix(
+        points.iloc[[5]], points.iloc[:5], destination_count=3
+    )
+    assert not len(od_count), od_count
+
+    od_count = nwa.od_cost_matrix(
+        points, points, destination_count=2, cutoff=100, lines=True
+    )
+    assert list(zip(od_count.origin, od_count.destination)) == [
+        (10, 10),
+        (10, 14),
+        (11, 11),
+        (12, 12),
+        (13, 13),
+        (14, 10),
+        (14, 14),
+        (15, 15),
+    ], od_count
+
+
+def test_lowest_costs_mask():
+    from sgis.networkanalysis._od_cost_matrix import _get_lowest_costs_mask
+
+    rng = np.random.default_rng(0)
+
+    # few unique costs to get many ties, and NaN and inf
+    origins = np.repeat(np.arange(200), rng.integers(1, 12, 200))
+    costs = rng.integers(0, 5, len(origins)).astype(float)
+    costs[rng.random(len(costs)) < 0.1] = np.nan
+    costs[rng.random(len(costs)) < 0.05] = np.inf
+
+    df = pd.DataFrame({"origin": origins, "cost": costs})
+    rank = df.groupby("origin")["cost"].rank()
+
+    for destination_count in [1, 2, 3, 5, 20]:
+        mask = _get_lowest_costs_mask(origins, costs, destination_count)
+        assert np.array_equal(mask, (rank <= destination_count).values), (
+            destination_count,
+            df.loc[mask != (rank <= destination_count).values],
+        )
+
+    assert not len(_get_lowest_costs_mask(origins[:0], costs[:0], 1))
+
+
+def test_graph_is_remade_when_needed_synthetic():
+    lines, points = _synthetic_network_and_points()
+    nwa = sg.NetworkAnalysis(lines, rules=_synthetic_rules())
+
+    def od_costs(origins=points.iloc[:2]):
+        od = nwa.od_cost_matrix(origins, points)
+        return od.set_index(["origin", "destination"])[nwa.rules.weight]
+
+    costs = od_costs()
+    assert costs[(10, 13)] == 220, costs
+
+    # unchanged network, rules and points
+    assert od_costs().equals(costs)
+    assert nwa._graph_updated_count == 1, nwa._graph_updated_count
+
+    # new points give a new graph, made from the unchanged network graph
+    network_graph = nwa._network_graph
+    assert od_costs(points.iloc[2:4]).loc[(12, 13)] == 120
+    assert nwa._network_graph is network_graph
+    assert od_costs().equals(costs)
+    assert nwa._graph_updated_count == 3, nwa._graph_updated_count
+
+    # the lines go from west to east, so point 11 in the west cannot be reached
+    nwa.rules.directed = True
+    directed_costs = od_costs()
+    assert np.isnan(directed_costs[(10, 11)]), directed_costs
+    assert directed_costs[(11, 10)] == 120, directed_costs
+    nwa.rules.directed = False
+    assert od_costs().equals(costs)
+
+    nwa.rules.weight = "minutes"
+    nwa.rules.nodedist_multiplier = None
+    minute_costs = od_costs()
+    assert minute_costs[(10, 11)] == 1, minute_costs
+    assert minute_costs[(10, 13)] == 5, minute_costs
+
+    # changed weights in the network, with the same points and rules
+    nwa.network.gdf["minutes"] = [10.0, 20.0, 30.0]
+    minute_costs = od_costs()
+    assert minute_costs[(10, 11)] == 10, minute_costs
+    assert minute_costs[(10, 13)] == 50, minute_costs
+
+    # removing the last line leaves point 13 too far from the network
+    nwa.rules.weight = "meters"
+    nwa.rules.nodedist_multiplier = 1
+    nwa.network.gdf = nwa.network.gdf.iloc[:2]
+    fewer_lines_costs = od_costs()
+    assert np.isnan(fewer_lines_costs[(10, 13)]), fewer_lines_costs
+    assert fewer_lines_costs.drop(13, level=1).equals(costs.drop(13, level=1))
+
+
 def main():
     from oslo import points_oslo, roads_oslo
 
+    test_od_cost_matrix_synthetic()
+    test_od_cost_matrix_destination_count_synthetic()
+    test_lowest_costs_mask()
+    test_graph_is_remade_when_needed_synthetic()
     test_network_analysis(points_oslo(), roads_oslo())
 
 
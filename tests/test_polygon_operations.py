@@ -285,9 +285,91 @@ def test_eliminate():
     assert list(eliminated.index) == [5, 7, 0], list(eliminated.index)
 
 
+def test_get_polygon_clusters_chained():
+    from shapely.geometry import box
+
+    # a overlaps b and b overlaps c, but a and c are disjoint
+    a = box(0, 0, 2, 2)
+    b = box(1, 0, 3, 2)
+    c = box(2.5, 0, 4, 2)
+    isolated1 = box(10, 10, 11, 11)
+    isolated2 = box(20, 20, 21, 21)
+    assert not a.intersects(c)
+
+    # shuffled, so the chain is not in the order of the rows
+    gdf = sg.to_gdf([c, isolated1, a, isolated2, b])
+    gdf.index = ["c", "isolated1", "a", "isolated2", "b"]
+
+    clustered = sg.get_polygon_clusters(gdf)
+    print(clustered)
+
+    assert list(clustered.index) == ["c", "isolated1", "a", "isolated2", "b"], list(
+        clustered.index
+    )
+    cluster = clustered["cluster"]
+    assert cluster["a"] == cluster["b"] == cluster["c"], cluster
+    assert cluster.nunique() == 3, cluster
+    assert cluster["isolated1"] != cluster["a"], cluster
+    assert cluster["isolated2"] not in (cluster["a"], cluster["isolated1"]), cluster
+
+    # the string clusters should give the same groups
+    clustered_str = sg.get_polygon_clusters(gdf, as_string=True)
+    assert list(clustered_str.index) == list(clustered.index)
+    cluster_str = clustered_str["cluster"]
+    assert all(isinstance(x, str) and "_" in x for x in cluster_str), cluster_str
+    assert cluster_str["a"] == cluster_str["b"] == cluster_str["c"], cluster_str
+    assert cluster_str.nunique() == 3, cluster_str
+    assert (
+        pd.crosstab(cluster, cluster_str).astype(bool).sum(axis=1).eq(1).all()
+    ), pd.crosstab(cluster, cluster_str)
+
+
+def test_eliminate_by_area():
+    from shapely.geometry import box
+
+    # two neighbours of equal area
+    left = box(-2, 0, 0, 2)
+    right = box(0.1, 0, 2.1, 2)
+    assert left.area == right.area
+
+    # slivers touching both neighbours and a polygon without neighbours
+    sliver = box(0, 0, 0.1, 2)
+    sliver2 = box(-2, 2, 2.1, 2.05)
+    isolated = box(10, 10, 11, 11)
+
+    polys = sg.to_gdf([left, right]).assign(what=["left", "right"])
+    to_eliminate = sg.to_gdf([sliver, isolated, sliver2]).assign(
+        what=["sliver", "isolated", "sliver2"]
+    )
+    # duplicated index in the polygons to eliminate
+    to_eliminate.index = [1, 1, 2]
+
+    total_area = round(sum(polys.area) + sum(to_eliminate.area), 3)
+
+    for index in [[3, 8], [4, 4]]:
+        polys.index = index
+        for eliminate_func in [sg.eliminate_by_largest, sg.eliminate_by_smallest]:
+            eliminated = eliminate_func(polys, to_eliminate)
+            print(eliminated)
+
+            # the isolated polygon survives with its own index
+            assert list(eliminated.index) == [*index, 1], list(eliminated.index)
+            assert list(eliminated.what) == ["left", "right", "isolated"], list(
+                eliminated.what
+            )
+            assert round(sum(eliminated.area), 3) == total_area, eliminated.area
+
+            # ties in area go to the first of the neighbours
+            assert list(round(eliminated.area, 3)) == [4.405, 4.0, 1.0], list(
+                eliminated.area
+            )
+
+
 if __name__ == "__main__":
     test_polygonsasrings()
     test_eliminate()
 
     test_close_holes()
     test_get_polygon_clusters()
+    test_get_polygon_clusters_chained()
+    test_eliminate_by_area()